@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+from models.batch import BatchWarper, collect_images, load_batch_maps, output_path_for
+from models.image_io import read_image
+
+def parse_size(text: str):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a saved mesh or maps to many images")
+    parser.add_argument("mesh", help="mesh .json or .mesh (as saved by the GUI), or maps .npz/.npy in any export format")
+    parser.add_argument("inputs", nargs="+", help="image files and/or directories of images")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument("--size", type=parse_size, help="output size WxH (default: size of the first image)")
+    parser.add_argument("--ext", help="output extension such as .png or .npy (default: keep the input's)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--float-maps", action="store_true", help="remap with float maps instead of fixed-point")
+    parser.add_argument("--skip-existing", action="store_true", help="skip images whose output already exists")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    images = collect_images(args.inputs)
+    if not images:
+        print("No images found", file=sys.stderr)
+        return 1
+    os.makedirs(args.output, exist_ok=True)
+
+    start = time.perf_counter()
+    image_size = None
+    if args.size is None and not args.mesh.lower().endswith((".npz", ".npy")):
+        first = read_image(images[0])
+        image_size = (first.shape[1], first.shape[0])
+    width, height = args.size if args.size else (None, None)
+    mapX, mapY = load_batch_maps(args.mesh, width, height, image_size)
+
+    tasks = [(path, output_path_for(path, args.output, args.ext)) for path in images]
+    if args.skip_existing:
+        tasks = [task for task in tasks if not os.path.exists(task[1])]
+
+    failures = 0
+    with BatchWarper(mapX, mapY, args.workers, fixed_point=not args.float_maps) as warper:
+        print(f"Maps {warper.output_width}x{warper.output_height} ready in {time.perf_counter() - start:.2f} s, "
+              f"{len(tasks)} images on {warper.workers} workers")
+        run_start = time.perf_counter()
+        for done, (image_path, output_path, seconds, error) in enumerate(warper.run(tasks), 1):
+            if error is not None:
+                failures += 1
+                print(f"[{done}/{len(tasks)}] {image_path}: {error}", file=sys.stderr)
+            elif not args.quiet:
+                elapsed = time.perf_counter() - run_start
+                print(f"[{done}/{len(tasks)}] {os.path.basename(output_path)} {seconds * 1000:.1f} ms "
+                      f"({done / elapsed:.1f} images/s)")
+
+    elapsed = time.perf_counter() - run_start
+    warped = len(tasks) - failures
+    rate = warped / elapsed if elapsed > 0 else 0.0
+    print(f"Warped {warped} images in {elapsed:.2f} s ({rate:.1f} images/s, "
+          f"{rate * warper.output_width * warper.output_height / 1e6:.1f} Mpx/s), {failures} failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import os
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from models.mesh_grid import MeshGrid
+from models.warp_engine import default_backends
+
+FIXTURE_IMAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "images", "Test Image1-051503.bmp")
+
+GRID_SIZES = [5, 20, 50, 100, 200]
+OUTPUT_SIZES = {
+    "VGA": (640, 480),
+    "HD": (1280, 720),
+    "FHD": (1920, 1080),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+DTYPES = ["gray8", "bgr8", "gray16", "gray32f"]
+# Sizes swept by --quick
+QUICK_GRID_SIZES = [5, 20, 50]
+QUICK_OUTPUT_SIZES = ["VGA", "HD", "FHD"]
+
+@dataclass
+class BenchmarkCase:
+    """One measured operation: setup() builds the inputs once and returns the callable that is timed"""
+    name: str
+    group: str
+    params: Dict[str, object]
+    setup: Callable[[], Callable[[], object]]
+    # Work done per call, for throughput (e.g. output pixels or queries)
+    units: float
+    unit: str
+
+class SkipCase(Exception):
+    """Raised by a setup whose combination is not supported here"""
+
+_fixture_cache: Dict[str, np.ndarray] = {}
+
+def fixture_image(dtype: str = "gray8") -> np.ndarray:
+    """The bundled test image converted to one of DTYPES"""
+    if dtype not in _fixture_cache:
+        image = cv2.imread(FIXTURE_IMAGE, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise Exception(f"Failed to load fixture image {FIXTURE_IMAGE}")
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if dtype == "gray8":
+            converted = gray
+        elif dtype == "bgr8":
+            converted = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        elif dtype == "gray16":
+            converted = gray.astype(np.uint16) * 257
+        elif dtype == "gray32f":
+            converted = gray.astype(np.float32) / 255.0
+        else:
+            raise Exception(f"Unknown fixture dtype: {dtype}")
+        _fixture_cache[dtype] = converted
+    return _fixture_cache[dtype]
+
+def warped_mesh(grid: int, image_height: int, image_width: int, seed: int = 0) -> MeshGrid:
+    """Regular mesh with a reproducible jitter of a fraction of a cell, so no cell folds"""
+    mesh = MeshGrid(grid, grid, image_height, image_width)
+    rng = np.random.default_rng(seed)
+    cell = min(image_width, image_height) / grid
+    coords = mesh.get_points_array() + rng.uniform(-0.2, 0.2, mesh.coords.shape) * cell
+    mesh.set_points_array(coords)
+    return mesh
+
+def _map_case(backend_index: int, grid: int, size: str, interpolation: str) -> BenchmarkCase:
+    width, height = OUTPUT_SIZES[size]
+    backend_name = default_backends()[backend_index].name
+
+    def setup():
+        image = fixture_image()
+        backend = default_backends()[backend_index]
+        if not backend.supports(grid, grid, width, height, interpolation):
+            raise SkipCase(f"{backend.name} does not support this grid and size")
+        points = warped_mesh(grid, *image.shape[:2]).get_points_array()
+        return lambda: backend.compute_maps(points, width, height, interpolation)
+
+    return BenchmarkCase(f"maps/{backend_name}/{interpolation}/{grid}x{grid}/{size}", "maps",
+                         {"backend": backend_name, "interpolation": interpolation, "grid": grid, "size": size},
+                         setup, width * height / 1e6, "Mpx")
+
+def _remap_case(dtype: str, size: str, fixed_point: bool) -> BenchmarkCase:
+    width, height = OUTPUT_SIZES[size]
+
+    def setup():
+        image = fixture_image(dtype)
+        mapX, mapY = warped_mesh(20, *image.shape[:2]).get_maps(width, height)
+        if fixed_point:
+            mapX, mapY = cv2.convertMaps(mapX, mapY, cv2.CV_16SC2)
+        return lambda: cv2.remap(image, mapX, mapY, cv2.INTER_LINEAR)
+
+    kind = "fixed" if fixed_point else "float"
+    return BenchmarkCase(f"remap/{kind}/{dtype}/{size}", "remap",
+                         {"maps": kind, "dtype": dtype, "size": size}, setup, width * height / 1e6, "Mpx")
+
+def _point_info_case(grid: int, queries: int = 10000) -> BenchmarkCase:
+    def setup():
+        image = fixture_image()
+        height, width = image.shape[:2]
+        mesh = warped_mesh(grid, height, width)
+        rng = np.random.default_rng(1)
+        targets = np.column_stack([rng.uniform(0, width, queries), rng.uniform(0, height, queries)]).tolist()
+        mesh.get_point_index()
+
+        def run():
+            for x, y in targets:
+                mesh.find_nearest_point(x, y, 10)
+        return run
+
+    return BenchmarkCase(f"point_info/{grid}x{grid}", "point_info", {"grid": grid, "queries": queries},
+                         setup, queries, "queries")
+
+def _display_case(dtype: str, size: str) -> Optional[BenchmarkCase]:
+    """The array work of utils.image_utils.create_tk_image; PhotoImage itself needs a display"""
+    try:
+        from utils.image_utils import to_display_8bit
+    except ImportError:
+        return None
+    width, height = OUTPUT_SIZES[size]
+
+    def setup():
+        try:
+            from PIL import Image
+        except ImportError:
+            # Without Image.fromarray the path is incomplete, and for gray8 it times a no-op
+            raise SkipCase("PIL is not installed")
+        image = cv2.resize(fixture_image(dtype), (width, height), interpolation=cv2.INTER_NEAREST)
+        return lambda: Image.fromarray(to_display_8bit(image))
+
+    return BenchmarkCase(f"display/{dtype}/{size}", "display", {"dtype": dtype, "size": size},
+                         setup, width * height / 1e6, "Mpx")
+
+def build_cases(quick: bool = False) -> List[BenchmarkCase]:
+    grids = QUICK_GRID_SIZES if quick else GRID_SIZES
+    sizes = QUICK_OUTPUT_SIZES if quick else list(OUTPUT_SIZES)
+    cases = []
+    for backend_index in range(len(default_backends())):
+        for grid in grids:
+            for size in sizes:
+                cases.append(_map_case(backend_index, grid, size, "bilinear"))
+    for grid in grids:
+        for size in sizes:
+            cases.append(_map_case(0, grid, size, "spline"))
+    for dtype in DTYPES:
+        for size in sizes:
+            for fixed_point in (False, True):
+                cases.append(_remap_case(dtype, size, fixed_point))
+    for grid in grids:
+        cases.append(_point_info_case(grid))
+    for dtype in DTYPES:
+        for size in sizes[:4]:
+            case = _display_case(dtype, size)
+            if case is not None:
+                cases.append(case)
+    return cases
@@ -0,0 +1,183 @@
+import argparse
+import datetime
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+# Allow `python benchmarks/run.py` as well as `python -m benchmarks.run`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from benchmarks.cases import BenchmarkCase, SkipCase, build_cases
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results.json")
+
+# tracemalloc only sees Python and numpy allocations. Arrays returned by cv2 are numpy arrays and
+# are counted, but OpenCV's internal temporary buffers are allocated natively and are not
+PEAK_NOTE = ("peak_bytes counts Python/numpy allocations only; OpenCV's internal buffers are not included, "
+             "so opencv cases under-report")
+
+def measure(case: BenchmarkCase, repeat: int, min_seconds: float) -> dict:
+    """Median/min wall time over at least `repeat` calls and the traced peak allocation of one call"""
+    run = case.setup()
+    run()  # warm caches and lazy initialisation
+
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat or time.perf_counter() - start < min_seconds:
+        t = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t)
+
+    # Traced separately: tracemalloc slows allocation-heavy Python code
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "name": case.name,
+        "group": case.group,
+        "params": case.params,
+        "calls": len(times),
+        "median_s": median,
+        "min_s": min(times),
+        "peak_bytes": peak,
+        "throughput": case.units / median if median > 0 else 0.0,
+        "unit": case.unit + "/s",
+    }
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "opencv_threads": cv2.getNumThreads(),
+    }
+
+def parse_thresholds(values: List[str]) -> Dict[str, float]:
+    """["remap=0.3", "maps/numpy/*=0.5"] -> {pattern: fraction}"""
+    thresholds = {}
+    for value in values:
+        pattern, _, fraction = value.rpartition("=")
+        if not pattern:
+            raise Exception(f"Expected PATTERN=FRACTION, got {value}")
+        thresholds[pattern] = float(fraction)
+    return thresholds
+
+def threshold_for(result: dict, default: float, overrides: Dict[str, float]) -> float:
+    """Last matching override by group or name pattern, else the default"""
+    threshold = default
+    for pattern, value in overrides.items():
+        if pattern == result["group"] or fnmatch.fnmatch(result["name"], pattern):
+            threshold = value
+    return threshold
+
+def compare(results: List[dict], baseline: dict, default: float, overrides: Dict[str, float],
+            memory_threshold: Optional[float]) -> List[str]:
+    """Regression messages for cases slower (or bigger) than the baseline beyond their threshold"""
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        threshold = threshold_for(result, default, overrides)
+        ratio = result["median_s"] / old["median_s"] if old["median_s"] > 0 else 1.0
+        result["baseline_median_s"] = old["median_s"]
+        result["ratio"] = ratio
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{result['name']}: {ratio:.2f}x slower "
+                               f"({old['median_s'] * 1000:.2f} -> {result['median_s'] * 1000:.2f} ms, "
+                               f"threshold +{threshold:.0%})")
+        if memory_threshold is not None and old.get("peak_bytes"):
+            growth = result["peak_bytes"] / old["peak_bytes"]
+            if growth > 1.0 + memory_threshold:
+                regressions.append(f"{result['name']}: peak memory {growth:.2f}x "
+                                   f"({old['peak_bytes'] / 2**20:.1f} -> {result['peak_bytes'] / 2**20:.1f} MB)")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless benchmarks of map generation, remap, hit-testing and display conversion")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="only run cases whose name matches this glob (repeatable), e.g. 'remap/*'")
+    parser.add_argument("--quick", action="store_true", help="small grids and outputs only (up to 50x50, FHD)")
+    parser.add_argument("--repeat", type=int, default=5, help="minimum timed calls per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds of timed calls per case")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="results JSON path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown against the baseline as a fraction (default 0.2 = 20%%)")
+    parser.add_argument("--threshold-for", action="append", default=[], metavar="PATTERN=FRACTION",
+                        help="per-group or per-name-glob threshold, e.g. point_info=0.5 (repeatable)")
+    parser.add_argument("--memory-threshold", type=float, default=None,
+                        help="also flag peak-memory growth beyond this fraction (Python/numpy allocations only)")
+    parser.add_argument("--list", action="store_true", help="list the selected cases without running them")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.quick)
+    if args.filter:
+        cases = [c for c in cases if any(fnmatch.fnmatch(c.name, f) for f in args.filter)]
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+
+    results = []
+    skipped = []
+    for index, case in enumerate(cases, 1):
+        try:
+            result = measure(case, args.repeat, args.min_time)
+        except SkipCase as e:
+            skipped.append({"name": case.name, "reason": str(e)})
+            continue
+        results.append(result)
+        print(f"[{index}/{len(cases)}] {case.name:<40} {result['median_s'] * 1000:10.3f} ms "
+              f"{result['throughput']:10.1f} {result['unit']:<11} peak {result['peak_bytes'] / 2**20:8.1f} MB",
+              flush=True)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, parse_thresholds(args.threshold_for),
+                              args.memory_threshold)
+
+    report = {"environment": environment(), "results": results, "skipped": skipped, "regressions": regressions,
+              "notes": [PEAK_NOTE]}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    print(f"{len(results)} cases measured, {len(skipped)} skipped; results in {args.output}")
+    for entry in skipped:
+        print(f"skipped {entry['name']}: {entry['reason']}")
+    print(f"Note: {PEAK_NOTE}")
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# (module, import-time budget in seconds, modules it must not pull in)
+BUDGETS = [
+    ("models", 0.05, ("cv2", "tkinter", "PIL")),
+    ("models.mesh_grid", 0.5, ("cv2", "tkinter", "PIL")),
+    ("models.batch", 0.5, ("models.mesh_grid", "tkinter", "PIL")),
+    ("models.video", 0.5, ("models.mesh_grid", "tkinter", "PIL")),
+    ("viewmodels", 1.0, ("tkinter", "PIL")),
+    ("batch_warp", 0.5, ("models.mesh_grid", "tkinter", "PIL")),
+    ("main", 0.05, ("cv2", "tkinter", "PIL")),
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [m for m in {forbidden!r} if m in sys.modules]]))
+"""
+
+def measure(module: str, forbidden, repeat: int):
+    """Best-of-repeat import time in a fresh interpreter, its process wall time, and forbidden modules loaded"""
+    best_import = best_process = float("inf")
+    loaded = []
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, forbidden=tuple(forbidden))],
+                                capture_output=True, text=True, cwd=root, env=env)
+        process = time.perf_counter() - start
+        if result.returncode != 0:
+            raise Exception(f"Importing {module} failed:\n{result.stderr.strip()}")
+        seconds, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        best_import = min(best_import, seconds)
+        best_process = min(best_process, process)
+    return best_import, best_process, loaded
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check cold import times of the core modules against their budgets")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module (best is kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, e.g. for slow machines")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module, budget, forbidden in BUDGETS:
+        budget *= args.scale
+        seconds, process, loaded = measure(module, forbidden, args.repeat)
+        problems = []
+        if seconds > budget:
+            problems.append(f"over budget {budget * 1000:.0f} ms")
+        if loaded:
+            problems.append("loaded " + ", ".join(loaded))
+        failures += bool(problems)
+        print(f"{module:<18}{seconds * 1000:8.1f} ms import {process * 1000:8.1f} ms process  "
+              f"{'FAIL: ' + '; '.join(problems) if problems else 'ok'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
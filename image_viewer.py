@@ -7,6 +7,8 @@ import json
 from PIL import Image, ImageTk
 import os
 
+from models.warp_engine import WarpEngine
+
 class MeshWarpApp:
     def __init__(self, master):
         self.master = master
@@ -18,6 +20,8 @@ class MeshWarpApp:
         self.mapX = None
         self.mapY = None
         self.mesh_points = []
+        self.warp_engine = WarpEngine()
+        self.calibrated_size = None
 
         self.create_widgets()
         
@@ -190,45 +194,12 @@ class MeshWarpApp:
             output_width = int(self.width_entry.get())
             output_height = int(self.height_entry.get())
 
-            # Create mapX and mapY
-            self.mapX = np.zeros((output_height, output_width), dtype=np.float32)
-            self.mapY = np.zeros((output_height, output_width), dtype=np.float32)
-
-            # Convert mesh points to numpy arrays for interpolation
+            # Generate mapX and mapY with the fastest backend for this grid
             src_points = np.float32(self.mesh_points).reshape(rows+1, cols+1, 2)
-            dst_points = np.zeros((rows+1, cols+1, 2), dtype=np.float32)
-            
-            # Create regular grid in destination
-            for i in range(rows+1):
-                for j in range(cols+1):
-                    dst_points[i,j] = [j * output_width/cols, i * output_height/rows]
-
-            # Interpolate the mapping
-            for i in range(output_height):
-                for j in range(output_width):
-                    # Find the corresponding source point
-                    x = j * cols / output_width
-                    y = i * rows / output_height
-                    
-                    # Get the four surrounding points
-                    x0, y0 = int(x), int(y)
-                    x1, y1 = min(x0 + 1, cols), min(y0 + 1, rows)
-                    
-                    # Bilinear interpolation weights
-                    wx = x - x0
-                    wy = y - y0
-                    
-                    # Get source points
-                    p00 = src_points[y0, x0]
-                    p01 = src_points[y0, x1]
-                    p10 = src_points[y1, x0]
-                    p11 = src_points[y1, x1]
-                    
-                    # Interpolate
-                    point = (1-wy)*((1-wx)*p00 + wx*p01) + wy*((1-wx)*p10 + wx*p11)
-                    
-                    self.mapX[i,j] = point[0]
-                    self.mapY[i,j] = point[1]
+            if self.calibrated_size != (rows, cols, output_width, output_height):
+                self.warp_engine.calibrate(src_points, output_width, output_height)
+                self.calibrated_size = (rows, cols, output_width, output_height)
+            self.mapX, self.mapY = self.warp_engine.compute_maps(src_points, output_width, output_height)
 
             self.output_image = cv2.remap(self.input_image, self.mapX, self.mapY, cv2.INTER_LINEAR)
             self.display_image(self.output_image, self.output_canvas)
@@ -331,6 +302,10 @@ class MeshWarpApp:
                 np.savez(filepath, mapX=self.mapX, mapY=self.mapY)
                 self.status_bar.config(text=f"Map files saved to: {filepath}")
 
-root = tk.Tk()
-app = MeshWarpApp(root)
-root.mainloop()
+def main():
+    root = tk.Tk()
+    app = MeshWarpApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
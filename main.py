@@ -1,7 +1,6 @@
-import tkinter as tk
-from views.main_window import MainWindow
-
 def main():
+    # Imported here so tools that only import this module do not load the GUI stack
+    from views.main_window import MainWindow
     app = MainWindow()
     app.mainloop()
 
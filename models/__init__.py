@@ -1,3 +1,36 @@
-from .mesh_grid import MeshGrid, MeshPoint
+import importlib
 
-__all__ = ['MeshGrid', 'MeshPoint']
+# Public name -> submodule; submodules (and cv2 with them) are imported on first access,
+# so importing one part of the package does not load the rest
+_EXPORTS = {
+    'MeshGrid': 'mesh_grid', 'MeshPoint': 'mesh_grid',
+    'INTERPOLATION_MODES': 'interpolation', 'InterpolationTableCache': 'interpolation',
+    'InterpolationTables': 'interpolation',
+    'WarpEngine': 'warp_engine', 'WarpBackend': 'warp_engine', 'NumpyWarpBackend': 'warp_engine',
+    'MatmulWarpBackend': 'warp_engine', 'OpenCVWarpBackend': 'warp_engine',
+    'TiledRemapper': 'tiled_remap', 'TileTiming': 'tiled_remap',
+    'StreamingRenderer': 'streaming', 'ImageSource': 'streaming', 'open_image_source': 'streaming',
+    'compute_inverse_maps': 'inverse_map',
+    'CellIndex': 'point_transform', 'TRANSFORM_DIRECTIONS': 'point_transform',
+    'PointIndex': 'point_index',
+    'MeshHistory': 'mesh_history', 'MeshEdit': 'mesh_history',
+    'RenderCache': 'render_cache',
+    'DiskMapCache': 'disk_cache',
+    'load_mesh': 'mesh_io', 'save_mesh': 'mesh_io',
+    'read_image': 'image_io', 'write_image': 'image_io',
+    'BatchWarper': 'batch',
+    'VideoWarper': 'video', 'FrameSource': 'video', 'FrameSink': 'video', 'warp_video': 'video',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
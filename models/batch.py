@@ -0,0 +1,107 @@
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Tuple
+from models.image_io import IMAGE_EXTENSIONS, read_image, write_image
+from models.map_io import as_remap_maps, load_maps
+
+# Outcome of one image: input path, output path, seconds spent in the worker, error message or None
+BatchResult = Tuple[str, str, float, Optional[str]]
+
+def load_batch_maps(filepath: str, output_width: Optional[int] = None, output_height: Optional[int] = None,
+                    image_size: Optional[Tuple[int, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Maps from a file in any export format, or generated from a mesh (.json or binary .mesh)
+
+    A mesh needs an output size; it defaults to image_size (width, height),
+    the size of the images the mesh was edited on.
+    """
+    if filepath.lower().endswith((".npz", ".npy")):
+        return load_maps(filepath)
+
+    # Only needed to render a mesh; workers that apply finished maps never import it
+    from models.mesh_io import load_mesh
+    if output_width is None or output_height is None:
+        if image_size is None:
+            raise Exception("Output size is required to render a mesh")
+        output_width, output_height = image_size
+    mesh = load_mesh(filepath, output_height, output_width)
+    return mesh.get_maps(output_width, output_height)
+
+def collect_images(paths: List[str]) -> List[str]:
+    """Expand directories into their image files (sorted) and keep plain files as given"""
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS))
+            images.extend(os.path.join(path, n) for n in names)
+        else:
+            images.append(path)
+    return images
+
+def output_path_for(image_path: str, output_dir: str, extension: Optional[str] = None) -> str:
+    name, ext = os.path.splitext(os.path.basename(image_path))
+    return os.path.join(output_dir, name + (extension or ext))
+
+# Per-process state set up once by the pool initializer
+_worker_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+def _init_worker(map_paths: Tuple[str, str]):
+    global _worker_maps
+    # One remap per process; OpenCV's own threads would only oversubscribe the cores
+    cv2.setNumThreads(1)
+    # Memory-mapped read-only: every worker shares the same pages of the map files
+    _worker_maps = (np.load(map_paths[0], mmap_mode="r"), np.load(map_paths[1], mmap_mode="r"))
+
+def _warp_one(task: Tuple[str, str]) -> BatchResult:
+    image_path, output_path = task
+    start = time.perf_counter()
+    try:
+        image = read_image(image_path)
+        output = cv2.remap(image, _worker_maps[0], _worker_maps[1], cv2.INTER_LINEAR)
+        write_image(output_path, output)
+        return image_path, output_path, time.perf_counter() - start, None
+    except Exception as e:
+        return image_path, output_path, time.perf_counter() - start, str(e)
+
+class BatchWarper:
+    """Applies one set of maps to many images with a process pool
+
+    The maps are converted once (to fixed-point unless disabled) and written
+    as .npy files to a temporary directory, which every worker memory-maps,
+    so N workers cost one copy of the maps instead of N.
+    """
+    def __init__(self, mapX: np.ndarray, mapY: np.ndarray, workers: Optional[int] = None,
+                 fixed_point: bool = True, temp_dir: Optional[str] = None):
+        self.output_height, self.output_width = mapX.shape[:2]
+        self.workers = workers or os.cpu_count() or 1
+        self.fixed_point = fixed_point
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="meshwarp_maps_", dir=temp_dir)
+
+        maps = as_remap_maps(mapX, mapY, fixed_point)
+        self.map_paths = (os.path.join(self._temp_dir.name, "map1.npy"),
+                          os.path.join(self._temp_dir.name, "map2.npy"))
+        for path, array in zip(self.map_paths, maps):
+            np.save(path, array)
+
+    def run(self, tasks: List[Tuple[str, str]], chunksize: int = 4) -> Iterator[BatchResult]:
+        """Warp (input path, output path) pairs, yielding results in completion order"""
+        if self.workers == 1:
+            _init_worker(self.map_paths)
+            for task in tasks:
+                yield _warp_one(task)
+            return
+
+        with Pool(self.workers, initializer=_init_worker, initargs=(self.map_paths,)) as pool:
+            yield from pool.imap_unordered(_warp_one, tasks, chunksize=chunksize)
+
+    def close(self):
+        self._temp_dir.cleanup()
+
+    def __enter__(self) -> 'BatchWarper':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from typing import Hashable, Optional, Tuple
+
+# Default location of the persistent map cache and session file
+APP_DIR = os.path.join(os.path.expanduser("~"), ".meshwarpcontrol")
+
+class DiskMapCache:
+    """Directory of generated maps stored as .npy files that are memory-mapped on load
+
+    Each entry is one (2, height, width) float32 array holding mapX and mapY.
+    Reads refresh a file's modification time, and the least recently used
+    files are deleted once the directory exceeds max_bytes. put_async()
+    writes on a single background thread so renders never wait for the disk.
+    """
+    def __init__(self, directory: str = os.path.join(APP_DIR, "map_cache"), max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        # Bytes in the directory, counted once and then kept up to date by put() and evict()
+        self._total_bytes: Optional[int] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    def path_for(self, key: Hashable) -> str:
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ".npy")
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Read-only memory-mapped (mapX, mapY) for key, or None"""
+        path = self.path_for(key)
+        try:
+            maps = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return maps[0], maps[1]
+
+    def put(self, key: Hashable, mapX: np.ndarray, mapY: np.ndarray):
+        """Store maps for key; written to a temporary file first so readers never see partial data"""
+        path = self.path_for(key)
+        if os.path.exists(path):
+            return
+        size = 2 * mapX.size * np.dtype(np.float32).itemsize
+        if size > self.max_bytes:
+            return
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # The .npy header of a (2, height, width) array followed by both maps, without stacking them
+                np.lib.format.write_array_header_1_0(f, {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                                                         "fortran_order": False, "shape": (2,) + mapX.shape})
+                for m in (mapX, mapY):
+                    np.ascontiguousarray(m, dtype=np.float32).tofile(f)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if self._total_bytes is not None:
+            self._total_bytes += os.path.getsize(path)
+        if self._total_bytes is None or self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def put_async(self, key: Hashable, mapX: np.ndarray, mapY: np.ndarray) -> Future:
+        """Queue put() on the writer thread; the maps must not be modified afterwards
+
+        A full or read-only cache directory only means the entry is not stored.
+        """
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="map-cache")
+        return self._writer.submit(self._put_quietly, key, mapX, mapY)
+
+    def _put_quietly(self, key: Hashable, mapX: np.ndarray, mapY: np.ndarray):
+        try:
+            self.put(key, mapX, mapY)
+        except OSError:
+            pass
+
+    def flush(self):
+        """Wait for queued writes to finish"""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npy"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                # Still memory-mapped somewhere (Windows); try again next time
+                continue
+            total -= size
+        self._total_bytes = total
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        self._total_bytes = None
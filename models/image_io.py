@@ -0,0 +1,47 @@
+import os
+import cv2
+import numpy as np
+
+# Sample types each output format can store without losing bit depth
+_FORMAT_DTYPES = {
+    ".png": (np.uint8, np.uint16),
+    ".tif": (np.uint8, np.uint16, np.float32),
+    ".tiff": (np.uint8, np.uint16, np.float32),
+    ".pgm": (np.uint8, np.uint16),
+    ".ppm": (np.uint8, np.uint16),
+    ".pnm": (np.uint8, np.uint16),
+    ".jp2": (np.uint8, np.uint16),
+}
+
+# Extensions read_image can load
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".pgm", ".ppm", ".pnm", ".jp2", ".npy")
+
+def read_image(filepath: str) -> np.ndarray:
+    """Load an image with its native channel count and bit depth (BGR/BGRA order for color)
+
+    .npy files hold the array as write_image saved it.
+    """
+    if filepath.lower().endswith(".npy"):
+        image = np.load(filepath)
+        if image.ndim not in (2, 3):
+            raise Exception(f"Expected a (height, width) or (height, width, channels) array in {filepath}, "
+                            f"got {image.shape}")
+        return image
+    image = cv2.imread(filepath, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise Exception(f"Failed to load image from {filepath}")
+    return image
+
+def write_image(filepath: str, image: np.ndarray):
+    """Save an image as-is; refuses formats that would silently reduce its bit depth"""
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".npy":
+        np.save(filepath, image)
+        return
+
+    allowed = _FORMAT_DTYPES.get(ext, (np.uint8,))
+    if image.dtype not in allowed:
+        formats = ", ".join(e for e, dtypes in _FORMAT_DTYPES.items() if image.dtype in dtypes) or ".npy"
+        raise Exception(f"{ext or 'This format'} cannot store {image.dtype} images, use {formats} or .npy")
+    if not cv2.imwrite(filepath, image):
+        raise Exception(f"Failed to write image to {filepath}")
@@ -0,0 +1,166 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Tuple
+
+# Supported ways of interpolating between control points
+INTERPOLATION_MODES = ("bilinear", "spline")
+
+def position_taps(pos: np.ndarray, cells: int, interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+    """Tap indices and float64 weights, each (taps, n), for arbitrary grid positions along one axis
+
+    Positions outside [0, cells] are extrapolated from the first or last cell.
+    """
+    pos = np.asarray(pos, dtype=np.float64)
+    i = np.clip(np.floor(pos), 0, max(cells - 1, 0)).astype(np.intp)
+    t = pos - i
+    if interpolation == "bilinear":
+        return np.stack([i, np.minimum(i + 1, cells)]), np.stack([1 - t, t])
+    if interpolation != "spline":
+        raise Exception(f"Unknown interpolation mode: {interpolation}")
+
+    t2, t3 = t * t, t * t * t
+    weights = np.stack([
+        (-t3 + 2 * t2 - t) / 2,
+        (3 * t3 - 5 * t2 + 2) / 2,
+        (-3 * t3 + 4 * t2 + t) / 2,
+        (t3 - t2) / 2,
+    ])
+    index = np.stack([i - 1, i, i + 1, i + 2])
+
+    # Fold the extrapolated phantom points into their real neighbours
+    left = index[0] < 0
+    weights[1, left] += 2 * weights[0, left]
+    weights[2, left] -= weights[0, left]
+    weights[0, left] = 0
+    right = index[3] > cells
+    weights[2, right] += 2 * weights[3, right]
+    weights[1, right] -= weights[3, right]
+    weights[3, right] = 0
+
+    return np.clip(index, 0, cells), weights
+
+def axis_weights(cells: int, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Cell indices (i0, i1) and bilinear weights (w0, w1) along one output axis"""
+    index, weight = position_taps(np.arange(size, dtype=np.float64) * cells / size, cells)
+    return index[0], index[1], weight[0].astype(np.float32), weight[1].astype(np.float32)
+
+def spline_axis_weights(cells: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Catmull-Rom tap indices and weights, each (4, size), along one output axis
+
+    The curve passes through every control point. Missing neighbours beyond
+    the first and last point are linearly extrapolated (P[-1] = 2*P[0] - P[1]),
+    which is folded into the weights of the clamped taps.
+    """
+    index, weight = position_taps(np.arange(size, dtype=np.float64) * cells / size, cells, "spline")
+    return index, weight.astype(np.float32)
+
+def axis_taps(cells: int, size: int, interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+    """Tap indices and weights, each (taps, size), for one output axis"""
+    if interpolation == "bilinear":
+        i0, i1, w0, w1 = axis_weights(cells, size)
+        return np.stack([i0, i1]), np.stack([w0, w1])
+    if interpolation == "spline":
+        return spline_axis_weights(cells, size)
+    raise Exception(f"Unknown interpolation mode: {interpolation}")
+
+def weight_matrix(cells: int, size: int, interpolation: str = "bilinear") -> np.ndarray:
+    """Dense (size, cells+1) matrix holding the interpolation weights of one output axis"""
+    index, weight = axis_taps(cells, size, interpolation)
+    weights = np.zeros((size, cells + 1), dtype=np.float32)
+    idx = np.arange(size)
+    for k in range(index.shape[0]):
+        np.add.at(weights, (idx, index[k]), weight[k])
+    return weights
+
+@dataclass(frozen=True)
+class InterpolationTables:
+    """Per-axis tap indices and weights for one (rows, cols, output size, mode) combination"""
+    x_index: np.ndarray
+    x_weight: np.ndarray
+    y_index: np.ndarray
+    y_weight: np.ndarray
+    rows: int
+    cols: int
+
+    @classmethod
+    def build(cls, rows: int, cols: int, output_width: int, output_height: int,
+              interpolation: str = "bilinear") -> 'InterpolationTables':
+        return cls(*axis_taps(cols, output_width, interpolation), *axis_taps(rows, output_height, interpolation),
+                   rows, cols)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.x_index, self.x_weight, self.y_index, self.y_weight))
+
+    def affected_rect(self, row: int, col: int) -> Tuple[int, int, int, int]:
+        """Output rectangle (x_start, y_start, x_stop, y_stop) influenced by one control point"""
+        # Taps are sorted per pixel and non-decreasing along the axis, so the pixels
+        # using a control line form one run: first tap <= line <= last tap
+        x_start = int(np.searchsorted(self.x_index[-1], col, side="left"))
+        x_stop = int(np.searchsorted(self.x_index[0], col, side="right"))
+        y_start = int(np.searchsorted(self.y_index[-1], row, side="left"))
+        y_stop = int(np.searchsorted(self.y_index[0], row, side="right"))
+        return x_start, y_start, x_stop, y_stop
+
+def _nbytes(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return getattr(value, "nbytes", 0)
+
+class InterpolationTableCache:
+    """LRU cache of interpolation tables bounded by a memory budget (safe to share between threads)"""
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[object, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], object]):
+        """Return the cached value for key, building it with factory on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Build outside the lock; a concurrent miss on the same key just builds it twice
+        value = factory()
+        size = _nbytes(value)
+        if size <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = (value, size)
+                    self.current_bytes += size
+                    self._evict()
+        return value
+
+    def get_tables(self, rows: int, cols: int, output_width: int, output_height: int,
+                   interpolation: str = "bilinear") -> InterpolationTables:
+        """Tap indices and weights for the given grid, output size and mode"""
+        return self.get(("taps", interpolation, rows, cols, output_width, output_height),
+                        lambda: InterpolationTables.build(rows, cols, output_width, output_height, interpolation))
+
+    def get_weight_matrices(self, rows: int, cols: int, output_width: int, output_height: int,
+                            interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        """Dense (wx, wy) weight/basis matrices for separable matrix-product interpolation"""
+        return self.get(("dense", interpolation, rows, cols, output_width, output_height),
+                        lambda: (weight_matrix(cols, output_width, interpolation),
+                                 weight_matrix(rows, output_height, interpolation)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
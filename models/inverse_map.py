@@ -0,0 +1,106 @@
+import numpy as np
+from typing import Optional, Tuple
+
+def _lattice(size: int, step: int, cells: Optional[int] = None) -> np.ndarray:
+    """Sample positions 0, step, 2*step, ... that always include the last pixel
+
+    With `cells`, the pixels either side of every control line (k * size / cells)
+    are added too, so no lattice quad straddles a kink of the mesh.
+    """
+    positions = [np.arange(0, size, step), [size - 1]]
+    if cells:
+        lines = np.arange(1, cells) * size / cells
+        positions += [np.floor(lines), np.ceil(lines)]
+    return np.unique(np.concatenate(positions).astype(np.int64))
+
+def compute_inverse_maps(mapX: np.ndarray, mapY: np.ndarray, source_width: int, source_height: int,
+                         step: int = 8, chunk_pixels: int = 1 << 20,
+                         grid_shape: Optional[Tuple[int, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Invert forward maps (output pixel -> source pixel) into dense source -> output maps
+
+    The forward maps are sampled on a lattice every `step` output pixels and
+    each lattice quad is split into two triangles. Every triangle is
+    rasterised in source space and its source pixels get output coordinates
+    by barycentric interpolation, all vectorised in chunks of at most
+    `chunk_pixels` candidate pixels. Source pixels that no output pixel
+    reaches are set to -1, which cv2.remap treats as outside the image.
+    Pass the mesh's (rows, cols) as `grid_shape` to sample its control lines
+    as well; the maps are only piecewise smooth between them.
+    """
+    rows, cols = grid_shape if grid_shape is not None else (None, None)
+    us = _lattice(mapX.shape[1], step, cols)
+    vs = _lattice(mapX.shape[0], step, rows)
+    lx = mapX[np.ix_(vs, us)].astype(np.float64)
+    ly = mapY[np.ix_(vs, us)].astype(np.float64)
+    lu, lv = np.meshgrid(us.astype(np.float64), vs.astype(np.float64))
+
+    # Two triangles per lattice quad: (tl, tr, bl) and (br, bl, tr)
+    def corners(a: np.ndarray) -> np.ndarray:
+        tl, tr, bl, br = a[:-1, :-1], a[:-1, 1:], a[1:, :-1], a[1:, 1:]
+        first = np.stack([tl, tr, bl], axis=-1).reshape(-1, 3)
+        second = np.stack([br, bl, tr], axis=-1).reshape(-1, 3)
+        return np.concatenate([first, second])
+
+    tx, ty, tu, tv = corners(lx), corners(ly), corners(lu), corners(lv)
+
+    # Source pixel bounding box of every triangle
+    x_min = np.clip(np.ceil(tx.min(axis=1)), 0, source_width).astype(np.int64)
+    x_max = np.clip(np.floor(tx.max(axis=1)), -1, source_width - 1).astype(np.int64)
+    y_min = np.clip(np.ceil(ty.min(axis=1)), 0, source_height).astype(np.int64)
+    y_max = np.clip(np.floor(ty.max(axis=1)), -1, source_height - 1).astype(np.int64)
+    box_w = np.maximum(x_max - x_min + 1, 0)
+    box_h = np.maximum(y_max - y_min + 1, 0)
+
+    det = (ty[:, 1] - ty[:, 2]) * (tx[:, 0] - tx[:, 2]) + (tx[:, 2] - tx[:, 1]) * (ty[:, 0] - ty[:, 2])
+    counts = np.where(det != 0, box_w * box_h, 0)
+    safe_det = np.where(det != 0, det, 1)
+
+    # Barycentric coordinates are affine in (x, y): l = a*x + b*y + c per triangle
+    a0 = (ty[:, 1] - ty[:, 2]) / safe_det
+    b0 = (tx[:, 2] - tx[:, 1]) / safe_det
+    c0 = -a0 * tx[:, 2] - b0 * ty[:, 2]
+    a1 = (ty[:, 2] - ty[:, 0]) / safe_det
+    b1 = (tx[:, 0] - tx[:, 2]) / safe_det
+    c1 = -a1 * tx[:, 2] - b1 * ty[:, 2]
+    # ... and so are the output coordinates u = l0*u0 + l1*u1 + (1-l0-l1)*u2
+    def affine(w: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        d0, d1 = w[:, 0] - w[:, 2], w[:, 1] - w[:, 2]
+        return a0 * d0 + a1 * d1, b0 * d0 + b1 * d1, c0 * d0 + c1 * d1 + w[:, 2]
+    au, bu, cu = affine(tu)
+    av, bv, cv = affine(tv)
+
+    invX = np.full((source_height, source_width), -1, dtype=np.float32)
+    invY = np.full((source_height, source_width), -1, dtype=np.float32)
+
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(counts):
+        # Take as many triangles as fit in one chunk (at least one)
+        budget = (ends[first - 1] if first else 0) + chunk_pixels
+        last = max(int(np.searchsorted(ends, budget, side="right")), first + 1)
+        tri = np.arange(first, last)
+        first = last
+
+        n = counts[tri]
+        total = int(n.sum())
+        if total == 0:
+            continue
+        idx = np.repeat(tri, n)
+        local = np.arange(total) - np.repeat(np.cumsum(n) - n, n)
+        width = box_w[idx]
+        py = local // width
+        px = local - py * width
+        px += x_min[idx]
+        py += y_min[idx]
+
+        # Keep candidate pixels that fall inside their triangle
+        l0 = a0[idx] * px + b0[idx] * py + c0[idx]
+        l1 = a1[idx] * px + b1[idx] * py + c1[idx]
+        eps = -1e-9
+        inside = (l0 >= eps) & (l1 >= eps) & (1 - l0 - l1 >= eps)
+
+        idx, px, py = idx[inside], px[inside], py[inside]
+        invX[py, px] = au[idx] * px + bu[idx] * py + cu[idx]
+        invY[py, px] = av[idx] * px + bv[idx] * py + cv[idx]
+
+    return invX, invY
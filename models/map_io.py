@@ -0,0 +1,124 @@
+import os
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+# Export formats for remap maps, smallest to largest on disk for a typical mesh:
+#   "offsets16"  - float16 displacement from a linear (identity up to scale and shift) map,
+#                  compressed; within cv2.remap's 1/32 pixel resolution for displacements up
+#                  to 64 px, coarser beyond
+#   "fixed"      - OpenCV fixed-point CV_16SC2 + interpolation table, exactly what cv2.remap uses
+#   "compressed" - float32 mapX/mapY in a compressed .npz
+#   "npz"        - float32 mapX/mapY in a plain .npz (the original format)
+#   "npy"        - float32 mapX/mapY as two .npy files that are memory-mapped on load
+MAP_FORMATS = ("npz", "compressed", "offsets16", "fixed", "npy")
+
+def npy_pair_paths(filepath: str) -> Tuple[str, str]:
+    """name.npy -> (name_mapX.npy, name_mapY.npy)"""
+    base = filepath[:-4] if filepath.lower().endswith(".npy") else filepath
+    for suffix in ("_mapX", "_mapY"):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    return base + "_mapX.npy", base + "_mapY.npy"
+
+def _linear_axis(coefficients: np.ndarray, length: int) -> np.ndarray:
+    """slope * i + intercept for i in range(length), as float32"""
+    return (coefficients[0] * np.arange(length) + coefficients[1]).astype(np.float32)
+
+def _fit_axis(m: np.ndarray, axis: int) -> np.ndarray:
+    """Linear fit of the map's mean over `axis`, ignoring the -1 "unmapped" value of inverse maps"""
+    valid = m != -1
+    counts = valid.sum(axis=axis)
+    sums = np.where(valid, m, 0).sum(axis=axis, dtype=np.float64)
+    positions = np.nonzero(counts)[0]
+    if len(positions) < 2:
+        return np.zeros(2)
+    return np.polyfit(positions, sums[positions] / counts[positions], 1)
+
+def _offsets16(m: np.ndarray, base: np.ndarray) -> np.ndarray:
+    exact = m - base
+    offsets = exact.astype(np.float16)
+    # Coordinates outside the source are rounded further out, never back in, so the
+    # -1 of unmapped pixels still reads as outside after the float16 round trip
+    inward = (m < 0) & (offsets.astype(np.float32) > exact)
+    offsets[inward] = np.nextafter(offsets[inward], np.float16(-np.inf))
+    return offsets
+
+def save_maps(filepath: str, mapX: np.ndarray, mapY: np.ndarray, map_format: str = "npz",
+              fixed_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> List[str]:
+    """Write maps in one of MAP_FORMATS and return the paths written
+
+    fixed_maps may pass already converted fixed-point maps to avoid converting again.
+    """
+    if map_format not in MAP_FORMATS:
+        raise Exception(f"Unknown map format: {map_format}")
+
+    if map_format == "npy":
+        paths = npy_pair_paths(filepath)
+        np.save(paths[0], np.asarray(mapX, dtype=np.float32))
+        np.save(paths[1], np.asarray(mapY, dtype=np.float32))
+        return list(paths)
+
+    if map_format == "npz":
+        np.savez(filepath, mapX=mapX, mapY=mapY)
+    elif map_format == "compressed":
+        np.savez_compressed(filepath, mapX=mapX, mapY=mapY)
+    elif map_format == "offsets16":
+        height, width = mapX.shape
+        # Offsets are taken from a linear fit per axis rather than from x -> x, so an
+        # output scaled relative to the input still leaves only small offsets
+        baseX = _fit_axis(mapX, 0)
+        baseY = _fit_axis(mapY, 1)
+        offsetX = _offsets16(mapX, _linear_axis(baseX, width)[None, :])
+        offsetY = _offsets16(mapY, _linear_axis(baseY, height)[:, None])
+        if not (np.isfinite(offsetX).all() and np.isfinite(offsetY).all()):
+            raise Exception("Map offsets exceed the float16 range")
+        np.savez_compressed(filepath, offsetX=offsetX, offsetY=offsetY, baseX=baseX, baseY=baseY)
+    else:
+        map1, map2 = fixed_maps if fixed_maps is not None else cv2.convertMaps(mapX, mapY, cv2.CV_16SC2)
+        np.savez_compressed(filepath, map1=map1, map2=map2)
+    # np.savez appends .npz to paths without it
+    return [filepath if filepath.endswith(".npz") else filepath + ".npz"]
+
+def load_maps(filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Maps ready to pass to cv2.remap, in whichever format the file holds
+
+    Float formats give float32 (mapX, mapY); the fixed-point format gives
+    (CV_16SC2 map1, uint16 map2). Use is_fixed_point_maps() to tell them
+    apart. .npy files are memory-mapped read-only, so only the pages a remap
+    touches are read.
+    """
+    if filepath.lower().endswith(".npy"):
+        paths = npy_pair_paths(filepath)
+        if os.path.exists(paths[0]) and os.path.exists(paths[1]):
+            return np.load(paths[0], mmap_mode="r"), np.load(paths[1], mmap_mode="r")
+        # A single (2, height, width) array, as kept by the disk map cache
+        maps = np.load(filepath, mmap_mode="r")
+        if maps.ndim != 3 or maps.shape[0] != 2:
+            raise Exception(f"Expected a (2, height, width) map array in {filepath}, got {maps.shape}")
+        return maps[0], maps[1]
+
+    with np.load(filepath) as data:
+        keys = set(data.files)
+        if {"mapX", "mapY"} <= keys:
+            return data["mapX"].astype(np.float32, copy=False), data["mapY"].astype(np.float32, copy=False)
+        if {"map1", "map2"} <= keys:
+            return data["map1"], data["map2"]
+        if {"offsetX", "offsetY"} <= keys:
+            offsetX, offsetY = data["offsetX"], data["offsetY"]
+            height, width = offsetX.shape
+            mapX = offsetX.astype(np.float32)
+            mapX += _linear_axis(data["baseX"], width)[None, :]
+            mapY = offsetY.astype(np.float32)
+            mapY += _linear_axis(data["baseY"], height)[:, None]
+            return mapX, mapY
+    raise Exception(f"No maps found in {filepath}")
+
+def is_fixed_point_maps(map1: np.ndarray, map2: np.ndarray) -> bool:
+    return map1.dtype == np.int16 and map1.ndim == 3
+
+def as_remap_maps(map1: np.ndarray, map2: np.ndarray, fixed_point: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """The maps as fixed-point or float32 pairs, converting only if they are stored the other way"""
+    if is_fixed_point_maps(map1, map2):
+        return (map1, map2) if fixed_point else cv2.convertMaps(map1, map2, cv2.CV_32FC1)
+    return cv2.convertMaps(map1, map2, cv2.CV_16SC2) if fixed_point else (map1, map2)
@@ -1,19 +1,54 @@
 import numpy as np
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from models.interpolation import INTERPOLATION_MODES
+from models.warp_engine import NumpyWarpBackend
+from models.inverse_map import compute_inverse_maps
+from models.point_transform import CellIndex, transform_points
+from models.point_index import PointIndex
+
+# Shared so repeated get_maps calls reuse cached interpolation tables
+_map_backend = NumpyWarpBackend()
 
-@dataclass
 class MeshPoint:
-    x: float  # Changed to float for subpixel precision
-    y: float  # Changed to float for subpixel precision
-    row: int
-    col: int
+    """Lightweight view of one control point stored in a MeshGrid's coordinate array"""
+    __slots__ = ("_grid", "row", "col")
+
+    def __init__(self, grid: 'MeshGrid', row: int, col: int):
+        self._grid = grid
+        self.row = row
+        self.col = col
+
+    @property
+    def x(self) -> float:
+        return float(self._grid.coords[self.row, self.col, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._grid.set_point(self.row, self.col, value, self.y)
+
+    @property
+    def y(self) -> float:
+        return float(self._grid.coords[self.row, self.col, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._grid.set_point(self.row, self.col, self.x, value)
+
+    def __repr__(self) -> str:
+        return f"MeshPoint(x={self.x}, y={self.y}, row={self.row}, col={self.col})"
 
 class MeshGrid:
     def __init__(self, rows: int, cols: int, image_height: int, image_width: int, border_percentage: float = 0.1):
         self.rows = rows
         self.cols = cols
-        self.points: List[List[MeshPoint]] = []
+        # One of INTERPOLATION_MODES: piecewise "bilinear" or smooth Catmull-Rom "spline"
+        self.interpolation = "bilinear"
+        # Canonical storage: (rows+1, cols+1, 2) array of subpixel (x, y) coordinates
+        self.coords = np.zeros((rows + 1, cols + 1, 2), dtype=np.float64)
+        # Backward transforms reuse this index until the coordinates or mode change
+        self._cell_index: Optional[CellIndex] = None
+        # Hit-testing index, built on first use and updated as points move
+        self._point_index: Optional[PointIndex] = None
         self.initialize_grid(image_height, image_width, border_percentage)
 
     def initialize_grid(self, image_height: int, image_width: int, border_percentage: float):
@@ -24,99 +59,97 @@ class MeshGrid:
         x = np.linspace(border_w, image_width - border_w, self.cols + 1)
         y = np.linspace(border_h, image_height - border_h, self.rows + 1)
         xv, yv = np.meshgrid(x, y)
-        
-        # Convert to MeshPoint objects organized by rows
-        self.points = []
-        for r in range(self.rows + 1):
-            row_points = []
-            for c in range(self.cols + 1):
-                point = MeshPoint(
-                    x=float(xv[r, c]),  # Convert to float for subpixel precision
-                    y=float(yv[r, c]),  # Convert to float for subpixel precision
-                    row=r,
-                    col=c
-                )
-                row_points.append(point)
-            self.points.append(row_points)
+        self.coords = np.stack([xv, yv], axis=-1)
+
+    @property
+    def points(self) -> List[List[MeshPoint]]:
+        """Control points as nested rows of MeshPoint views, created on demand"""
+        return [[MeshPoint(self, r, c) for c in range(self.cols + 1)] for r in range(self.rows + 1)]
 
     def get_point(self, row: int, col: int) -> MeshPoint:
-        return self.points[row][col]
+        return MeshPoint(self, row, col)
 
-    def set_point(self, row: int, col: int, x: float, y: float):  # Changed to float
-        self.points[row][col].x = x
-        self.points[row][col].y = y
+    def set_point(self, row: int, col: int, x: float, y: float):
+        self.coords[row, col] = (x, y)
+        if self._point_index is not None:
+            self._point_index.move(row * (self.cols + 1) + col)
 
-    def get_all_points(self) -> List[Tuple[float, float]]:  # Changed return type
+    def get_all_points(self) -> List[Tuple[float, float]]:
         """Returns flattened list of (x,y) coordinates for compatibility"""
-        points = []
-        for row in self.points:
-            for point in row:
-                points.append((point.x, point.y))
-        return points
+        return [tuple(p) for p in self.coords.reshape(-1, 2).tolist()]
+
+    def get_points_array(self) -> np.ndarray:
+        """Returns the (rows+1, cols+1, 2) coordinate array itself, without copying"""
+        return self.coords
+
+    def set_points_array(self, points: np.ndarray):
+        """Replaces all coordinates; float64 arrays of the right shape are adopted without copying"""
+        points = np.asarray(points, dtype=np.float64)
+        if points.shape != (self.rows + 1, self.cols + 1, 2):
+            raise Exception(f"Expected points of shape {(self.rows + 1, self.cols + 1, 2)}, got {points.shape}")
+        self.coords = points
+
+    def get_point_index(self) -> PointIndex:
+        """Spatial index over the control points; rebuilt if the coordinate array was replaced"""
+        if self._point_index is None or self._point_index.coords is not self.coords:
+            self._point_index = PointIndex(self.coords)
+        return self._point_index
+
+    def find_nearest_point(self, x: float, y: float, max_distance: float) -> Optional[Tuple[MeshPoint, float]]:
+        """Closest control point within max_distance and its distance"""
+        found = self.get_point_index().nearest(x, y, max_distance)
+        if found is None:
+            return None
+        index, dist = found
+        row, col = divmod(index, self.cols + 1)
+        return self.get_point(row, col), dist
+
+    def find_points_within(self, x: float, y: float, radius: float) -> List[Tuple[MeshPoint, float]]:
+        """All control points within radius, nearest first"""
+        return [(self.get_point(*divmod(index, self.cols + 1)), dist)
+                for dist, index in self.get_point_index().query_radius(x, y, radius)]
+
+    def set_interpolation(self, interpolation: str):
+        if interpolation not in INTERPOLATION_MODES:
+            raise Exception(f"Unknown interpolation mode: {interpolation}")
+        self.interpolation = interpolation
 
     def to_dict(self) -> dict:
         return {
             "rows": self.rows,
             "cols": self.cols,
-            "points": [[{"x": p.x, "y": p.y} for p in row] for row in self.points]
+            "interpolation": self.interpolation,
+            "points": [[{"x": x, "y": y} for x, y in row] for row in self.coords.tolist()]
         }
 
     @classmethod
     def from_dict(cls, data: dict, image_height: int, image_width: int) -> 'MeshGrid':
         mesh = cls(data["rows"], data["cols"], image_height, image_width, border_percentage=0)
-        mesh.points = []
-        for r, row_data in enumerate(data["points"]):
-            row_points = []
-            for c, point_data in enumerate(row_data):
-                point = MeshPoint(
-                    x=float(point_data["x"]),  # Convert to float
-                    y=float(point_data["y"]),  # Convert to float
-                    row=r,
-                    col=c
-                )
-                row_points.append(point)
-            mesh.points.append(row_points)
+        mesh.set_points_array([[(p["x"], p["y"]) for p in row] for row in data["points"]])
+        mesh.set_interpolation(data.get("interpolation", "bilinear"))
         return mesh
 
     def get_maps(self, output_width: int, output_height: int) -> Tuple[np.ndarray, np.ndarray]:
         """Generate mapX and mapY for cv2.remap"""
-        mapX = np.zeros((output_height, output_width), dtype=np.float32)
-        mapY = np.zeros((output_height, output_width), dtype=np.float32)
+        return _map_backend.compute_maps(self.get_points_array(), output_width, output_height, self.interpolation)
 
-        # Convert mesh points to numpy arrays for interpolation
-        src_points = np.array([[(p.x, p.y) for p in row] for row in self.points], dtype=np.float32)
-        
-        # Create regular grid in destination
-        dst_points = np.zeros((self.rows+1, self.cols+1, 2), dtype=np.float32)
-        for i in range(self.rows+1):
-            for j in range(self.cols+1):
-                dst_points[i,j] = [j * output_width/self.cols, i * output_height/self.rows]
-
-        # Interpolate the mapping
-        for i in range(output_height):
-            for j in range(output_width):
-                # Find the corresponding source point
-                x = j * self.cols / output_width
-                y = i * self.rows / output_height
-                
-                # Get the four surrounding points
-                x0, y0 = int(x), int(y)
-                x1, y1 = min(x0 + 1, self.cols), min(y0 + 1, self.rows)
-                
-                # Bilinear interpolation weights
-                wx = x - x0
-                wy = y - y0
-                
-                # Get source points
-                p00 = src_points[y0, x0]
-                p01 = src_points[y0, x1]
-                p10 = src_points[y1, x0]
-                p11 = src_points[y1, x1]
-                
-                # Interpolate
-                point = (1-wy)*((1-wx)*p00 + wx*p01) + wy*((1-wx)*p10 + wx*p11)
-                
-                mapX[i,j] = point[0]
-                mapY[i,j] = point[1]
-
-        return mapX, mapY
+    def get_inverse_maps(self, output_width: int, output_height: int, image_width: int, image_height: int,
+                         step: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate maps from input image pixels to output pixels (-1 where nothing maps)"""
+        mapX, mapY = self.get_maps(output_width, output_height)
+        return compute_inverse_maps(mapX, mapY, image_width, image_height, step,
+                                    grid_shape=(self.rows, self.cols))
+
+    def get_cell_index(self) -> CellIndex:
+        """Spatial index over the warped cells, rebuilt only when the mesh changed"""
+        index = self._cell_index
+        if (index is None or index.interpolation != self.interpolation
+                or not np.array_equal(index.coords, self.coords)):
+            index = self._cell_index = CellIndex(self.coords, self.interpolation)
+        return index
+
+    def transform_points(self, points: np.ndarray, direction: str, output_width: int, output_height: int) -> np.ndarray:
+        """Map (N, 2) points output -> input ("forward") or input -> output ("backward")"""
+        index = self.get_cell_index() if direction == "backward" else None
+        return transform_points(self.coords, points, output_width, output_height, direction,
+                                self.interpolation, index)
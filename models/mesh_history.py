@@ -0,0 +1,98 @@
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class MeshEdit:
+    """Coordinates of the points one edit changed, before and after"""
+    indices: np.ndarray  # flat point indices, int32
+    old: np.ndarray      # (n, 2) float64
+    new: np.ndarray      # (n, 2) float64
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.old.nbytes + self.new.nbytes
+
+class MeshHistory:
+    """Undo/redo stacks of per-edit point deltas bounded by a memory budget
+
+    Moves recorded between begin_gesture() and end_gesture() collapse into a
+    single edit that keeps each point's first old and last new position, so
+    a whole drag is undone in one step. The oldest edits are dropped once
+    the stored deltas exceed max_bytes.
+    """
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._undo: Deque[MeshEdit] = deque()
+        self._redo: List[MeshEdit] = []
+        # flat index -> [old, new] of the gesture being recorded
+        self._gesture: Optional[Dict[int, List[Tuple[float, float]]]] = None
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def begin_gesture(self):
+        self.end_gesture()
+        self._gesture = {}
+
+    def end_gesture(self):
+        gesture, self._gesture = self._gesture, None
+        if gesture:
+            changed = {i: (old, new) for i, (old, new) in gesture.items() if old != new}
+            if changed:
+                self._push(self._make_edit(changed))
+
+    def record(self, index: int, old: Tuple[float, float], new: Tuple[float, float]):
+        """Record one point move"""
+        if self._gesture is not None:
+            entry = self._gesture.setdefault(index, [old, new])
+            entry[1] = new
+        elif old != new:
+            self._push(self._make_edit({index: (old, new)}))
+
+    def undo(self) -> Optional[MeshEdit]:
+        """Pop the latest edit; apply its `old` coordinates to revert it"""
+        self.end_gesture()
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        self.current_bytes -= edit.nbytes
+        self._redo.append(edit)
+        return edit
+
+    def redo(self) -> Optional[MeshEdit]:
+        """Pop the latest undone edit; apply its `new` coordinates to repeat it"""
+        self.end_gesture()
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        self._undo.append(edit)
+        self.current_bytes += edit.nbytes
+        return edit
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._gesture = None
+        self.current_bytes = 0
+
+    @staticmethod
+    def _make_edit(changes: Dict[int, Tuple[Tuple[float, float], Tuple[float, float]]]) -> MeshEdit:
+        indices = np.fromiter(changes.keys(), dtype=np.int32, count=len(changes))
+        old = np.array([c[0] for c in changes.values()], dtype=np.float64).reshape(-1, 2)
+        new = np.array([c[1] for c in changes.values()], dtype=np.float64).reshape(-1, 2)
+        return MeshEdit(indices, old, new)
+
+    def _push(self, edit: MeshEdit):
+        self._redo.clear()
+        self._undo.append(edit)
+        self.current_bytes += edit.nbytes
+        while self.current_bytes > self.max_bytes and len(self._undo) > 1:
+            self.current_bytes -= self._undo.popleft().nbytes
@@ -0,0 +1,87 @@
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+from typing import Optional
+from models.mesh_grid import MeshGrid
+
+# Binary layout (little-endian):
+#   magic (8 bytes) | version, metadata bytes, rows, cols (uint32 each) | metadata JSON
+#   | zero padding to a 64-byte boundary | (rows+1, cols+1, 2) float64 coordinates
+# Loading reads the coordinates into an ordinary in-memory array with a single
+# np.fromfile call, so no per-point Python work is done and the file is not held open.
+MESH_MAGIC = b"MWMESH\x00\x00"
+MESH_VERSION = 1
+MESH_EXTENSION = ".mesh"
+_HEADER = struct.Struct("<8sIIII")
+_ALIGNMENT = 64
+_POINT_DTYPE = np.dtype("<f8")
+
+def is_binary_mesh(filepath: str) -> bool:
+    with open(filepath, "rb") as f:
+        return f.read(len(MESH_MAGIC)) == MESH_MAGIC
+
+def save_mesh(mesh: MeshGrid, filepath: str, metadata: Optional[dict] = None):
+    """Write a mesh as JSON for .json paths and in the binary format otherwise"""
+    if filepath.lower().endswith(".json"):
+        with open(filepath, "w") as f:
+            json.dump(mesh.to_dict(), f, indent=2)
+        return
+
+    meta = dict(metadata or {}, interpolation=mesh.interpolation)
+    meta_bytes = json.dumps(meta).encode()
+    data_offset = -(-(_HEADER.size + len(meta_bytes)) // _ALIGNMENT) * _ALIGNMENT
+    header = _HEADER.pack(MESH_MAGIC, MESH_VERSION, len(meta_bytes), mesh.rows, mesh.cols) + meta_bytes
+    # Written beside the target and swapped in, so a failed save never leaves a truncated mesh
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.ljust(data_offset, b"\x00"))
+            # One contiguous write of the coordinate array, no per-point work
+            f.write(np.ascontiguousarray(mesh.coords, dtype=_POINT_DTYPE).data)
+        os.replace(temp_path, filepath)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def read_mesh_metadata(filepath: str) -> dict:
+    """Header fields of a binary mesh: version, rows, cols, data offset and the metadata dict"""
+    with open(filepath, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise Exception(f"Truncated mesh file: {filepath}")
+        magic, version, meta_length, rows, cols = _HEADER.unpack(header)
+        if magic != MESH_MAGIC:
+            raise Exception(f"Not a binary mesh file: {filepath}")
+        if version > MESH_VERSION:
+            raise Exception(f"Mesh file version {version} is newer than supported version {MESH_VERSION}")
+        meta = json.loads(f.read(meta_length).decode())
+
+    data_offset = -(-(_HEADER.size + meta_length) // _ALIGNMENT) * _ALIGNMENT
+    expected = data_offset + (rows + 1) * (cols + 1) * 2 * _POINT_DTYPE.itemsize
+    if os.path.getsize(filepath) < expected:
+        raise Exception(f"Truncated mesh file: {filepath}")
+    return {"version": version, "rows": rows, "cols": cols, "data_offset": data_offset, "metadata": meta}
+
+def load_mesh(filepath: str, image_height: int = 0, image_width: int = 0) -> MeshGrid:
+    """Read a mesh in either format, detected from the file contents
+
+    Binary mesh points are read into memory in one contiguous read and the
+    file is closed again, so the mesh can be saved back over the same path
+    (Windows refuses to replace a file that is still open or mapped).
+    """
+    if not is_binary_mesh(filepath):
+        with open(filepath, "r") as f:
+            return MeshGrid.from_dict(json.load(f), image_height, image_width)
+
+    info = read_mesh_metadata(filepath)
+    rows, cols = info["rows"], info["cols"]
+    count = (rows + 1) * (cols + 1) * 2
+    points = np.fromfile(filepath, dtype=_POINT_DTYPE, count=count, offset=info["data_offset"])
+    points = points.reshape(rows + 1, cols + 1, 2)
+    mesh = MeshGrid(rows, cols, image_height, image_width, border_percentage=0)
+    mesh.set_points_array(points)
+    mesh.set_interpolation(info["metadata"].get("interpolation", "bilinear"))
+    return mesh
@@ -0,0 +1,105 @@
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional
+
+@dataclass(frozen=True)
+class SpanStats:
+    """Rolling timing summary of one named stage, in seconds"""
+    name: str
+    last: float
+    p50: float
+    p95: float
+    count: int
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+class RenderMetrics:
+    """Durations of named pipeline stages over the last `window` occurrences of each
+
+    Spans may be recorded from the render worker and the UI thread at once.
+    """
+    def __init__(self, window: int = 100):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def stats(self) -> Dict[str, SpanStats]:
+        """Last, median and 95th percentile of every stage recorded so far, in recording order"""
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+        stats = {}
+        for name, samples in snapshot.items():
+            ordered = sorted(samples)
+            stats[name] = SpanStats(name, samples[-1], _percentile(ordered, 0.5), _percentile(ordered, 0.95),
+                                    len(samples))
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+def format_stats(stats: Dict[str, SpanStats]) -> str:
+    """'maps 3.1/2.9/5.0 ms | remap ...' with last/p50/p95 per stage"""
+    return " | ".join(f"{s.name} {s.last * 1000:.1f}/{s.p50 * 1000:.1f}/{s.p95 * 1000:.1f} ms"
+                      for s in stats.values())
+
+class RenderProfiler:
+    """Writes a cProfile dump and a tracemalloc snapshot for every captured render
+
+    Files are named render_0001.prof / render_0001.tracemalloc; open them
+    with pstats.Stats and tracemalloc.Snapshot.load.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def capture(self, label: str = "render") -> Iterator[None]:
+        # One capture at a time: only one profiler can be active and tracemalloc is process-wide,
+        # so a synchronous render waits for a profiled background render to finish
+        with self._lock:
+            self._count += 1
+            base = os.path.join(self.directory, f"{label}_{self._count:04d}")
+            with self._capture(base):
+                yield
+
+    @contextmanager
+    def _capture(self, base: str) -> Iterator[None]:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            profiler.dump_stats(base + ".prof")
+            snapshot.dump(base + ".tracemalloc")
@@ -0,0 +1,72 @@
+import math
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+class PointIndex:
+    """Uniform bucket grid over control points for nearest-point and radius queries
+
+    Buckets are keyed by integer cell coordinates and hold flat point
+    indices, so moving a point only touches its old and new bucket. The
+    bucket size defaults to the average point spacing, which keeps about one
+    point per bucket.
+    """
+    def __init__(self, coords: np.ndarray, bucket_size: Optional[float] = None):
+        # Shares memory with the grid; positions only change through move()
+        self.coords = coords
+        self._flat = coords.reshape(-1, 2)
+        if bucket_size is None:
+            extent = np.ptp(self._flat, axis=0) if len(self._flat) else np.ones(2)
+            bucket_size = max(float(extent.max()) / max(math.sqrt(len(self._flat)), 1.0), 1.0)
+        self.bucket_size = bucket_size
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._keys: List[Tuple[int, int]] = []
+        for index, (x, y) in enumerate(self._flat.tolist()):
+            key = self._key(x, y)
+            self._keys.append(key)
+            self._buckets.setdefault(key, []).append(index)
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.bucket_size)), int(math.floor(y / self.bucket_size))
+
+    def move(self, index: int):
+        """Re-bucket one point after its coordinates changed"""
+        key = self._key(*self._flat[index].tolist())
+        old = self._keys[index]
+        if key == old:
+            return
+        bucket = self._buckets[old]
+        bucket.remove(index)
+        if not bucket:
+            del self._buckets[old]
+        self._buckets.setdefault(key, []).append(index)
+        self._keys[index] = key
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Tuple[float, int]]:
+        """(distance, flat index) of every point within radius, nearest first"""
+        span = radius / self.bucket_size
+        if (2 * span + 1) ** 2 > len(self._flat):
+            # Radius covers more buckets than there are points: scan everything
+            dist = np.hypot(self._flat[:, 0] - x, self._flat[:, 1] - y)
+            hits = np.flatnonzero(dist <= radius)
+            return sorted(zip(dist[hits].tolist(), hits.tolist()))
+
+        x0, y0 = self._key(x - radius, y - radius)
+        x1, y1 = self._key(x + radius, y + radius)
+        found = []
+        for bx in range(x0, x1 + 1):
+            for by in range(y0, y1 + 1):
+                for index in self._buckets.get((bx, by), ()):
+                    px, py = self._flat[index].tolist()
+                    dist = math.hypot(px - x, py - y)
+                    if dist <= radius:
+                        found.append((dist, index))
+        found.sort()
+        return found
+
+    def nearest(self, x: float, y: float, max_distance: float) -> Optional[Tuple[int, float]]:
+        """Flat index and distance of the closest point within max_distance (lowest index on ties)"""
+        found = self.query_radius(x, y, max_distance)
+        if not found:
+            return None
+        dist, index = found[0]
+        return index, dist
@@ -0,0 +1,301 @@
+import numpy as np
+from typing import Optional, Tuple
+from models.interpolation import position_taps
+
+# Directions accepted by transform_points
+TRANSFORM_DIRECTIONS = ("forward", "backward")
+
+def evaluate_grid(coords: np.ndarray, gx: np.ndarray, gy: np.ndarray,
+                  interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+    """Interpolate the control grid at fractional grid positions (gx along cols, gy along rows)"""
+    rows, cols = coords.shape[0] - 1, coords.shape[1] - 1
+    x_index, x_weight = position_taps(gx, cols, interpolation)
+    y_index, y_weight = position_taps(gy, rows, interpolation)
+
+    # Gather from flat per-channel arrays, which is much cheaper than fancy-indexing (N, 2) rows
+    flat_x = np.ascontiguousarray(coords[:, :, 0], dtype=np.float64).ravel()
+    flat_y = np.ascontiguousarray(coords[:, :, 1], dtype=np.float64).ravel()
+    x = np.zeros(x_index.shape[1], dtype=np.float64)
+    y = np.zeros(x_index.shape[1], dtype=np.float64)
+    for ky in range(len(y_index)):
+        row = y_index[ky] * (cols + 1)
+        for kx in range(len(x_index)):
+            weight = y_weight[ky] * x_weight[kx]
+            node = row + x_index[kx]
+            x += weight * flat_x.take(node)
+            y += weight * flat_y.take(node)
+    return x, y
+
+def _cross(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray) -> np.ndarray:
+    return ax * by - ay * bx
+
+def quad_terms(quads: np.ndarray) -> np.ndarray:
+    """(8, n) bilinear coefficients p00, e, f, g of quads (n, 4, 2) ordered p00, p10, p01, p11
+
+    A quad is p(s, t) = p00 + s*e + t*f + s*t*g for s, t in [0, 1].
+    """
+    p00, p10, p01, p11 = quads[:, 0], quads[:, 1], quads[:, 2], quads[:, 3]
+    e, f, g = p10 - p00, p01 - p00, p11 - p10 - p01 + p00
+    return np.concatenate([p00, e, f, g], axis=1).T.copy()
+
+def invert_quads(terms: np.ndarray, x: np.ndarray, y: np.ndarray, eps: float = 1e-9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Local (s, t) of each point in its quad, given per-point quad_terms columns (8, n)
+
+    Returns s, t and a mask of the points that actually lie inside their quad:
+    a root must be real, within the unit square, and map back onto the point.
+    """
+    ox, oy, ex, ey, fx, fy, gx, gy = terms
+    hx, hy = x - ox, y - oy
+
+    # h = s*e + t*f + s*t*g reduces to k2*t^2 + k1*t + k0 = 0
+    k2 = _cross(gx, gy, fx, fy)
+    k1 = _cross(ex, ey, fx, fy) + _cross(hx, hy, gx, gy)
+    k0 = _cross(hx, hy, ex, ey)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discriminant = k1 * k1 - 4 * k0 * k2
+        # Only rounding may push a real (double) root's discriminant below zero
+        real = discriminant >= -eps * (k1 * k1 + np.abs(4 * k0 * k2))
+        root = np.sqrt(np.maximum(discriminant, 0))
+        # Numerically stable quadratic roots; degenerates to -k0/k1 for parallelograms
+        q = -0.5 * (k1 + np.copysign(root, k1))
+        linear = np.abs(k2) < eps * np.maximum(np.abs(k1), 1)
+        t_a = np.where(linear, -k0 / k1, q / k2)
+        t_b = np.where(linear, t_a, k0 / q)
+
+        def solve_s(t: np.ndarray) -> np.ndarray:
+            # Divide by the larger component of the edge at height t
+            dx, dy = ex + gx * t, ey + gy * t
+            use_x = np.abs(dx) >= np.abs(dy)
+            return np.where(use_x, hx - fx * t, hy - fy * t) / np.where(use_x, dx, dy)
+
+        s_a, s_b = solve_s(t_a), solve_s(t_b)
+
+    tol = 1e-7
+    # Points on an edge are clipped by up to tol, which moves them by tol times the quad size
+    reach = 1e-6 * (1 + np.abs(ex) + np.abs(ey) + np.abs(fx) + np.abs(fy) + np.abs(gx) + np.abs(gy))
+    def inside(s: np.ndarray, t: np.ndarray) -> np.ndarray:
+        within = (s >= -tol) & (s <= 1 + tol) & (t >= -tol) & (t <= 1 + tol)
+        s, t = np.clip(s, 0, 1), np.clip(t, 0, 1)
+        with np.errstate(invalid="ignore"):
+            lands = np.hypot(s * ex + t * fx + s * t * gx - hx, s * ey + t * fy + s * t * gy - hy) <= reach
+        return real & within & lands
+
+    ok_a = inside(s_a, t_a)
+    s = np.where(ok_a, s_a, s_b)
+    t = np.where(ok_a, t_a, t_b)
+    return np.clip(s, 0, 1), np.clip(t, 0, 1), ok_a | inside(s_b, t_b)
+
+class CellIndex:
+    """Uniform bucket grid over the warped mesh cells in input image space
+
+    Each cell is split into `subdivisions` x `subdivisions` bilinear quads
+    (one for bilinear meshes, where that is exact). Buckets list the quads
+    whose bounding box overlaps them, so a backward lookup only tests a few
+    candidate quads per point. Spline meshes are refined with Newton steps
+    on the true interpolant afterwards.
+    """
+    def __init__(self, coords: np.ndarray, interpolation: str = "bilinear",
+                 subdivisions: Optional[int] = None, newton_steps: int = 2, border_tolerance: float = 1e-2):
+        self.coords = np.array(coords, dtype=np.float64)
+        self.interpolation = interpolation
+        self.rows, self.cols = self.coords.shape[0] - 1, self.coords.shape[1] - 1
+        if subdivisions is None:
+            subdivisions = 1 if interpolation == "bilinear" else 8
+        self.newton_steps = 0 if interpolation == "bilinear" else newton_steps
+        # Input pixels a border point found by the fallback may be off the true mesh edge
+        self.border_tolerance = border_tolerance
+
+        # Lattice of quad corners in grid and input coordinates
+        self.lattice_x = np.linspace(0, self.cols, self.cols * subdivisions + 1)
+        self.lattice_y = np.linspace(0, self.rows, self.rows * subdivisions + 1)
+        gx, gy = np.meshgrid(self.lattice_x, self.lattice_y)
+        nodes = np.stack(evaluate_grid(self.coords, gx.ravel(), gy.ravel(), interpolation), axis=-1)
+        nodes = nodes.reshape(gx.shape + (2,))
+        self.quad_cols = len(self.lattice_x) - 1
+        quads = np.stack([nodes[:-1, :-1], nodes[:-1, 1:], nodes[1:, :-1], nodes[1:, 1:]], axis=2).reshape(-1, 4, 2)
+        self.terms = quad_terms(quads)
+        low, high = quads.min(axis=1), quads.max(axis=1)
+        self.bounds = np.concatenate([low, high], axis=1).T.copy()
+
+        # About four buckets per quad keeps the candidate list per point short
+        self.origin = low.min(axis=0)
+        extent = np.maximum(high.max(axis=0) - self.origin, 1e-9)
+        count = len(quads)
+        self.buckets_x = max(1, int(np.sqrt(4 * count * extent[0] / extent[1])))
+        self.buckets_y = max(1, int(np.ceil(4 * count / self.buckets_x)))
+        self.bucket_size = extent / (self.buckets_x, self.buckets_y)
+        self.bucket_quads, self.bucket_start = self._fill_buckets(np.arange(count), low, high)
+
+        # Curved (spline) mesh edges bulge past the chords of the border quads, so input points
+        # on the edge can miss every quad. Border quads get a second bucket list with bounds
+        # grown by the largest bulge, searched before a point is reported as not covered.
+        self.border_margin = 0.0
+        if self.newton_steps:
+            self.border_margin = 2 * self._border_sag(nodes)
+            quad_row, quad_col = np.divmod(np.arange(count), self.quad_cols)
+            border = np.flatnonzero((quad_row == 0) | (quad_row == len(self.lattice_y) - 2)
+                                    | (quad_col == 0) | (quad_col == self.quad_cols - 1))
+            self.border_quads, self.border_start = self._fill_buckets(
+                border, low[border] - self.border_margin, high[border] + self.border_margin)
+
+    def _fill_buckets(self, quad_ids: np.ndarray, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR lists (quads, start offsets) of the quads whose bounds [low, high] overlap each bucket"""
+        bx0, by0 = self._bucket(low[:, 0], low[:, 1])
+        bx1, by1 = self._bucket(high[:, 0], high[:, 1])
+        spans_x, spans_y = bx1 - bx0 + 1, by1 - by0 + 1
+        spans = spans_x * spans_y
+
+        # Expand every quad into the buckets it overlaps
+        item = np.repeat(np.arange(len(quad_ids)), spans)
+        local = np.arange(len(item)) - np.repeat(np.cumsum(spans) - spans, spans)
+        bucket = (by0[item] + local // spans_x[item]) * self.buckets_x + bx0[item] + local % spans_x[item]
+        order = np.argsort(bucket, kind="stable")
+        start = np.zeros(self.buckets_x * self.buckets_y + 1, dtype=np.intp)
+        np.cumsum(np.bincount(bucket, minlength=self.buckets_x * self.buckets_y), out=start[1:])
+        return quad_ids[item[order]], start
+
+    def _border_sag(self, nodes: np.ndarray) -> float:
+        """Largest distance between a border chord's midpoint and the mesh edge it spans"""
+        mid_x = (self.lattice_x[:-1] + self.lattice_x[1:]) / 2
+        mid_y = (self.lattice_y[:-1] + self.lattice_y[1:]) / 2
+        edges = [(mid_x, np.zeros_like(mid_x), nodes[0]), (mid_x, np.full_like(mid_x, self.rows), nodes[-1]),
+                 (np.zeros_like(mid_y), mid_y, nodes[:, 0]), (np.full_like(mid_y, self.cols), mid_y, nodes[:, -1])]
+        sag = 0.0
+        for gx, gy, chain in edges:
+            x, y = evaluate_grid(self.coords, gx, gy, self.interpolation)
+            chord = (chain[:-1] + chain[1:]) / 2
+            sag = max(sag, float(np.hypot(x - chord[:, 0], y - chord[:, 1]).max()))
+        return sag
+
+    def _bucket(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        bx = np.clip(((x - self.origin[0]) / self.bucket_size[0]).astype(np.intp), 0, self.buckets_x - 1)
+        by = np.clip(((y - self.origin[1]) / self.bucket_size[1]).astype(np.intp), 0, self.buckets_y - 1)
+        return bx, by
+
+    def locate(self, x: np.ndarray, y: np.ndarray, chunk_points: int = 1 << 16) -> Tuple[np.ndarray, np.ndarray]:
+        """Grid positions (gx, gy) that map to the input points; NaN where no cell covers a point"""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        gx = np.full(x.shape, np.nan)
+        gy = np.full(x.shape, np.nan)
+        # Chunks keep the per-candidate temporaries cache-sized
+        for first in range(0, len(x), chunk_points):
+            chunk = slice(first, first + chunk_points)
+            gx[chunk], gy[chunk] = self._locate_chunk(x[chunk], y[chunk])
+        return gx, gy
+
+    def _candidates(self, x: np.ndarray, y: np.ndarray, bucket_quads: np.ndarray, bucket_start: np.ndarray,
+                    margin: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """(point, quad) pairs whose quad bounds, grown by margin, contain the point"""
+        with np.errstate(invalid="ignore"):
+            inside = ((x >= self.origin[0] - margin) & (y >= self.origin[1] - margin)
+                      & (x <= self.origin[0] + self.bucket_size[0] * self.buckets_x + margin)
+                      & (y <= self.origin[1] + self.bucket_size[1] * self.buckets_y + margin))
+        point = np.flatnonzero(inside)
+        bx, by = self._bucket(x[point], y[point])
+        bucket = by * self.buckets_x + bx
+        start = bucket_start[bucket]
+        counts = bucket_start[bucket + 1] - start
+
+        # Expand to (point, candidate quad) pairs and drop those outside the quad's bounding box
+        pair_point = np.repeat(point, counts)
+        local = np.arange(len(pair_point)) - np.repeat(np.cumsum(counts) - counts, counts)
+        quad = bucket_quads[np.repeat(start, counts) + local]
+        px, py = x[pair_point], y[pair_point]
+        bounds = self.bounds[:, quad]
+        near = ((px >= bounds[0] - margin) & (py >= bounds[1] - margin)
+                & (px <= bounds[2] + margin) & (py <= bounds[3] + margin))
+        return pair_point[near], quad[near]
+
+    def _grid_position(self, quad: np.ndarray, s: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        quad_row, quad_col = np.divmod(quad, self.quad_cols)
+        gx = self.lattice_x[quad_col] + s * (self.lattice_x[quad_col + 1] - self.lattice_x[quad_col])
+        gy = self.lattice_y[quad_row] + t * (self.lattice_y[quad_row + 1] - self.lattice_y[quad_row])
+        return gx, gy
+
+    def _locate_chunk(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        gx = np.full(x.shape, np.nan)
+        gy = np.full(x.shape, np.nan)
+        pair_point, quad = self._candidates(x, y, self.bucket_quads, self.bucket_start)
+        px, py = x[pair_point], y[pair_point]
+        s, t, hit = invert_quads(self.terms[:, quad], px, py)
+
+        # First containing quad wins (shared edges give the same position)
+        hit_pairs = np.flatnonzero(hit)
+        found, first = np.unique(pair_point[hit_pairs], return_index=True)
+        pairs = hit_pairs[first]
+        fx, fy = self._grid_position(quad[pairs], s[pairs], t[pairs])
+        gx[found], gy[found] = self._refine(fx, fy, px[pairs], py[pairs])
+
+        if self.border_margin > 0:
+            missed = np.flatnonzero(np.isnan(gx))
+            if len(missed):
+                gx[missed], gy[missed] = self._locate_border(x[missed], y[missed])
+        return gx, gy
+
+    def _locate_border(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Grid positions of points just outside the border quads, found from the closest one"""
+        gx = np.full(x.shape, np.nan)
+        gy = np.full(x.shape, np.nan)
+        pair_point, quad = self._candidates(x, y, self.border_quads, self.border_start, self.border_margin)
+        px, py = x[pair_point], y[pair_point]
+        terms = self.terms[:, quad]
+        s, t, _ = invert_quads(terms, px, py)
+        ox, oy, ex, ey, fx, fy, hx, hy = terms
+        distance = np.hypot(ox + s * ex + t * fx + s * t * hx - px, oy + s * ey + t * fy + s * t * hy - py)
+
+        # Closest quad per point, then Newton on the true edge; points it cannot reach stay NaN
+        order = np.lexsort((distance, pair_point))
+        found, first = np.unique(pair_point[order], return_index=True)
+        pairs = order[first]
+        sx, sy = self._grid_position(quad[pairs], s[pairs], t[pairs])
+        rx, ry = self._refine(sx, sy, px[pairs], py[pairs], self.newton_steps + 2)
+        mx, my = evaluate_grid(self.coords, rx, ry, self.interpolation)
+        close = np.hypot(mx - px[pairs], my - py[pairs]) <= self.border_tolerance
+        gx[found[close]], gy[found[close]] = rx[close], ry[close]
+        return gx, gy
+
+    def _refine(self, gx: np.ndarray, gy: np.ndarray, x: np.ndarray, y: np.ndarray,
+                steps: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Newton steps on the true interpolant, starting from the piecewise-bilinear estimate"""
+        h = 1e-4
+        for _ in range(self.newton_steps if steps is None else steps):
+            fx, fy = evaluate_grid(self.coords, gx, gy, self.interpolation)
+            dxx, dyx = evaluate_grid(self.coords, gx + h, gy, self.interpolation)
+            dxy, dyy = evaluate_grid(self.coords, gx, gy + h, self.interpolation)
+            j00, j10 = (dxx - fx) / h, (dyx - fy) / h
+            j01, j11 = (dxy - fx) / h, (dyy - fy) / h
+            det = j00 * j11 - j01 * j10
+            det = np.where(np.abs(det) > 1e-12, det, 1e-12)
+            rx, ry = x - fx, y - fy
+            gx = np.clip(gx + (j11 * rx - j01 * ry) / det, 0, self.cols)
+            gy = np.clip(gy + (j00 * ry - j10 * rx) / det, 0, self.rows)
+        return gx, gy
+
+def transform_points(coords: np.ndarray, points: np.ndarray, output_width: int, output_height: int,
+                     direction: str = "forward", interpolation: str = "bilinear",
+                     index: Optional[CellIndex] = None) -> np.ndarray:
+    """Map (N, 2) points through the mesh without building dense maps
+
+    "forward" takes output pixel coordinates to input image coordinates, like
+    sampling mapX/mapY; "backward" takes input coordinates to output pixels
+    and yields NaN for points no cell covers.
+    """
+    if direction not in TRANSFORM_DIRECTIONS:
+        raise Exception(f"Unknown transform direction: {direction}")
+    points = np.asarray(points, dtype=np.float64)
+    if points.shape[-1] != 2:
+        raise Exception(f"Expected points of shape (N, 2), got {points.shape}")
+    flat = points.reshape(-1, 2)
+    rows, cols = coords.shape[0] - 1, coords.shape[1] - 1
+
+    if direction == "forward":
+        x, y = evaluate_grid(coords, flat[:, 0] * cols / output_width, flat[:, 1] * rows / output_height,
+                             interpolation)
+    else:
+        if index is None:
+            index = CellIndex(coords, interpolation)
+        gx, gy = index.locate(flat[:, 0], flat[:, 1])
+        x, y = gx * output_width / cols, gy * output_height / rows
+    return np.stack([x, y], axis=-1).reshape(points.shape)
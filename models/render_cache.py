@@ -0,0 +1,71 @@
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+# mapX, mapY, fixed-point maps (or None) and output image of one rendered mesh state
+RenderEntry = Tuple[np.ndarray, np.ndarray, Optional[Tuple[np.ndarray, np.ndarray]], np.ndarray]
+
+def mesh_key(points: np.ndarray, output_width: int, output_height: int, interpolation: str, *extra: Hashable) -> tuple:
+    """Cache key from a fast hash of the point array plus grid shape, output size and mode"""
+    digest = hashlib.blake2b(np.ascontiguousarray(points).tobytes(), digest_size=16).digest()
+    return (digest, points.shape[0] - 1, points.shape[1] - 1, output_width, output_height, interpolation) + extra
+
+def _entry_bytes(entry: RenderEntry) -> int:
+    mapX, mapY, fixed_maps, output = entry
+    size = mapX.nbytes + mapY.nbytes + output.nbytes
+    if fixed_maps is not None:
+        size += fixed_maps[0].nbytes + fixed_maps[1].nbytes
+    return size
+
+class RenderCache:
+    """LRU cache of rendered maps and outputs bounded by a memory budget
+
+    Entries share their arrays with whoever stored or fetched them, so
+    callers must copy before modifying them in place.
+    """
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[RenderEntry, int]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[RenderEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, entry: RenderEntry):
+        size = _entry_bytes(entry)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (entry, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def report(self) -> str:
+        """One-line summary of cache usage"""
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (f"{len(self._entries)} renders, {self.current_bytes / 2**20:.1f}/{self.max_bytes / 2**20:.0f} MB, "
+                f"{self.hits} hits / {self.misses} misses ({rate:.0f}%)")
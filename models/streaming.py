@@ -0,0 +1,200 @@
+import os
+import struct
+import threading
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+from typing import Callable, Optional, Tuple
+from models.warp_engine import WarpEngine
+
+class ImageSource:
+    """Random-access view of a source image that only reads the requested window"""
+    def __init__(self, pixels: np.ndarray, palette: Optional[np.ndarray] = None):
+        # pixels may be a np.memmap; slicing it touches only the pages of the window
+        self.pixels = pixels
+        self.palette = palette
+        self.height, self.width = pixels.shape[:2]
+
+    def read(self, x0: int, y0: int, x1: int, y1: int, grayscale: bool = True) -> np.ndarray:
+        """Copy the window [y0:y1, x0:x1] into memory, optionally as grayscale"""
+        window = np.ascontiguousarray(self.pixels[y0:y1, x0:x1])
+        if self.palette is not None:
+            # A gray palette maps every index to itself, so the indices already are the
+            # single-channel image, as read_image returns it
+            if self._is_gray_palette():
+                return window
+            window = self.palette[window]
+        if grayscale and window.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if window.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            window = cv2.cvtColor(window, code)
+        return window
+
+    def _is_gray_palette(self) -> bool:
+        levels = np.arange(len(self.palette), dtype=np.uint8)
+        return bool(np.all(self.palette == levels[:, None]))
+
+def _open_bmp(filepath: str) -> ImageSource:
+    """Memory-map the pixel array of an uncompressed 8/24/32-bit BMP"""
+    with open(filepath, "rb") as f:
+        header = f.read(54)
+        if header[:2] != b"BM":
+            raise Exception(f"Not a BMP file: {filepath}")
+        data_offset = struct.unpack("<I", header[10:14])[0]
+        dib_size, width, height, _, bpp, compression = struct.unpack("<IiiHHI", header[14:34])
+        if compression != 0 or bpp not in (8, 24, 32):
+            raise Exception(f"Only uncompressed 8, 24 and 32-bit BMP files can be streamed: {filepath}")
+
+        palette = None
+        if bpp == 8:
+            colors = struct.unpack("<I", header[46:50])[0] or 256
+            f.seek(14 + dib_size)
+            palette = np.frombuffer(f.read(4 * colors), dtype=np.uint8).reshape(colors, 4)[:, :3].copy()
+
+    channels = bpp // 8
+    stride = ((bpp * width + 31) // 32) * 4
+    rows = np.memmap(filepath, dtype=np.uint8, mode="r", offset=data_offset, shape=(abs(height), stride))
+    pixels = rows[:, :width * channels]
+    pixels = pixels.reshape(abs(height), width) if channels == 1 else pixels.reshape(abs(height), width, channels)
+    # Positive heights are stored bottom-up
+    if height > 0:
+        pixels = pixels[::-1]
+    return ImageSource(pixels, palette)
+
+def open_image_source(filepath: str) -> ImageSource:
+    """Open a source image without decoding it fully (.npy and uncompressed .bmp are memory-mapped)"""
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".npy":
+        return ImageSource(np.load(filepath, mmap_mode="r"))
+    if ext == ".bmp":
+        return _open_bmp(filepath)
+
+    # Compressed formats cannot be windowed, so they are decoded once
+    image = cv2.imread(filepath, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise Exception(f"Failed to load image from {filepath}")
+    return ImageSource(image)
+
+class StripWriter(ABC):
+    """Writes an image to disk one horizontal strip at a time"""
+    def __init__(self, filepath: str, width: int, height: int, channels: int, dtype: np.dtype):
+        self.filepath = filepath
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+
+    @abstractmethod
+    def write(self, y0: int, strip: np.ndarray):
+        """Store the rows y0 .. y0 + len(strip); strips arrive top to bottom"""
+
+    def close(self):
+        pass
+
+class NpyStripWriter(StripWriter):
+    def __init__(self, filepath: str, width: int, height: int, channels: int, dtype: np.dtype):
+        super().__init__(filepath, width, height, channels, dtype)
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        self._array = np.lib.format.open_memmap(filepath, mode="w+", dtype=self.dtype, shape=shape)
+
+    def write(self, y0: int, strip: np.ndarray):
+        self._array[y0:y0 + strip.shape[0]] = strip
+        self._array.flush()
+
+    def close(self):
+        self._array.flush()
+        del self._array
+
+class BmpStripWriter(StripWriter):
+    """Top-down BMP so strips can be appended in output order"""
+    def __init__(self, filepath: str, width: int, height: int, channels: int, dtype: np.dtype):
+        super().__init__(filepath, width, height, channels, dtype)
+        if self.dtype != np.uint8 or channels not in (1, 3, 4):
+            raise Exception("BMP output supports 8-bit grayscale, BGR or BGRA images only, use .npy for other images")
+
+        bpp = 8 * channels
+        self._stride = ((bpp * width + 31) // 32) * 4
+        palette_size = 256 * 4 if channels == 1 else 0
+        data_offset = 14 + 40 + palette_size
+        file_size = data_offset + self._stride * height
+
+        self._file = open(filepath, "wb")
+        self._file.write(struct.pack("<2sIHHI", b"BM", file_size, 0, 0, data_offset))
+        self._file.write(struct.pack("<IiiHHIIiiII", 40, width, -height, 1, bpp, 0,
+                                     self._stride * height, 2835, 2835, 256 if channels == 1 else 0, 0))
+        if channels == 1:
+            levels = np.arange(256, dtype=np.uint8)
+            self._file.write(np.stack([levels, levels, levels, np.zeros_like(levels)], axis=1).tobytes())
+
+    def write(self, y0: int, strip: np.ndarray):
+        rows = strip.reshape(strip.shape[0], -1)
+        padded = np.zeros((rows.shape[0], self._stride), dtype=np.uint8)
+        padded[:, :rows.shape[1]] = rows
+        self._file.write(padded.tobytes())
+
+    def close(self):
+        self._file.close()
+
+def open_strip_writer(filepath: str, width: int, height: int, channels: int, dtype: np.dtype) -> StripWriter:
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".npy":
+        return NpyStripWriter(filepath, width, height, channels, dtype)
+    if ext == ".bmp":
+        return BmpStripWriter(filepath, width, height, channels, dtype)
+    raise Exception(f"Streaming output supports .bmp and .npy files, not {ext}")
+
+class StreamingRenderer:
+    """Renders a warp strip by strip without holding the full source, maps or output in memory
+
+    For every strip the maps are generated on demand, then each tile of the
+    strip reads only the source bounding box its maps reach. Peak memory is
+    bounded by strip_height x output width plus one source window per tile.
+    """
+    def __init__(self, strip_height: int = 256, tile_width: int = 1024, grayscale: bool = True):
+        self.strip_height = strip_height
+        self.tile_width = tile_width
+        self.grayscale = grayscale
+
+    @staticmethod
+    def source_window(mapX: np.ndarray, mapY: np.ndarray, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+        """Source bounding box (x0, y0, x1, y1) needed to bilinearly sample the given maps"""
+        x0 = max(int(np.floor(mapX.min())), 0)
+        y0 = max(int(np.floor(mapY.min())), 0)
+        x1 = min(int(np.floor(mapX.max())) + 2, width)
+        y1 = min(int(np.floor(mapY.max())) + 2, height)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+    def render(self, engine: WarpEngine, points: np.ndarray, source: ImageSource, output_path: str,
+               output_width: int, output_height: int, interpolation: str = "bilinear",
+               on_progress: Optional[Callable[[int, int], None]] = None, stop: Optional[threading.Event] = None):
+        """Warp source into output_path one strip at a time
+
+        on_progress(rows_done, output_height) is called after every strip;
+        setting stop abandons the render (the output file is left incomplete).
+        """
+        sample = source.read(0, 0, 1, 1, self.grayscale)
+        channels = 1 if sample.ndim == 2 else sample.shape[2]
+        writer = open_strip_writer(output_path, output_width, output_height, channels, sample.dtype)
+        try:
+            for y0 in range(0, output_height, self.strip_height):
+                if stop is not None and stop.is_set():
+                    raise Exception("Streaming render cancelled")
+                y1 = min(y0 + self.strip_height, output_height)
+                strip = np.zeros((y1 - y0, output_width) + sample.shape[2:], dtype=sample.dtype)
+                for x0 in range(0, output_width, self.tile_width):
+                    x1 = min(x0 + self.tile_width, output_width)
+                    mapX, mapY = engine.compute_region(points, output_width, output_height, (x0, y0, x1, y1),
+                                                       interpolation)
+                    window = self.source_window(mapX, mapY, source.width, source.height)
+                    if window is None:
+                        continue
+                    wx0, wy0, wx1, wy1 = window
+                    pixels = source.read(wx0, wy0, wx1, wy1, self.grayscale)
+                    # Integer offsets keep the shifted float32 coordinates exact
+                    strip[:, x0:x1] = cv2.remap(pixels, mapX - wx0, mapY - wy0, cv2.INTER_LINEAR)
+                writer.write(y0, strip)
+                if on_progress is not None:
+                    on_progress(y1, output_height)
+        finally:
+            writer.close()
@@ -0,0 +1,88 @@
+import os
+import time
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from models.warp_engine import WarpEngine
+
+@dataclass
+class TileTiming:
+    """Wall time spent on one horizontal output band"""
+    y_start: int
+    y_stop: int
+    map_seconds: float
+    remap_seconds: float
+
+    @property
+    def total_seconds(self) -> float:
+        return self.map_seconds + self.remap_seconds
+
+@dataclass
+class TiledRenderResult:
+    mapX: np.ndarray
+    mapY: np.ndarray
+    output: np.ndarray
+    fixed_maps: Optional[Tuple[np.ndarray, np.ndarray]]
+    tile_timings: List[TileTiming]
+
+class TiledRemapper:
+    """Generates maps and remaps the output in horizontal bands on a thread pool
+
+    Every band runs the same per-pixel computation as a single full-frame
+    call, so the output is bit-identical; numpy and cv2.remap release the
+    GIL, which lets the bands run in parallel.
+    """
+    def __init__(self, tile_height: int = 256, workers: Optional[int] = None):
+        self.tile_height = tile_height
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.tile_timings: List[TileTiming] = []
+
+    def bands(self, output_height: int) -> List[Tuple[int, int]]:
+        """(y_start, y_stop) of every band covering the output"""
+        step = max(1, self.tile_height)
+        return [(y, min(y + step, output_height)) for y in range(0, output_height, step)]
+
+    def render(self, engine: WarpEngine, points: np.ndarray, image: np.ndarray,
+               output_width: int, output_height: int, fixed_point: bool = False,
+               interpolation: str = "bilinear") -> TiledRenderResult:
+        """Compute maps and the remapped output band by band"""
+        mapX = np.empty((output_height, output_width), dtype=np.float32)
+        mapY = np.empty((output_height, output_width), dtype=np.float32)
+        output = np.empty((output_height, output_width) + image.shape[2:], dtype=image.dtype)
+        fixed_maps = None
+        if fixed_point:
+            fixed_maps = (np.empty((output_height, output_width, 2), dtype=np.int16),
+                          np.empty((output_height, output_width), dtype=np.uint16))
+
+        def render_band(band: Tuple[int, int]) -> TileTiming:
+            y0, y1 = band
+            start = time.perf_counter()
+            bandX, bandY = engine.compute_region(points, output_width, output_height, (0, y0, output_width, y1),
+                                                 interpolation)
+            mapX[y0:y1] = bandX
+            mapY[y0:y1] = bandY
+            mapped = time.perf_counter()
+
+            if fixed_maps is not None:
+                map1, map2 = cv2.convertMaps(mapX[y0:y1], mapY[y0:y1], cv2.CV_16SC2)
+                fixed_maps[0][y0:y1] = map1
+                fixed_maps[1][y0:y1] = map2
+                output[y0:y1] = cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
+            else:
+                output[y0:y1] = cv2.remap(image, mapX[y0:y1], mapY[y0:y1], cv2.INTER_LINEAR)
+            return TileTiming(y0, y1, mapped - start, time.perf_counter() - mapped)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            self.tile_timings = list(pool.map(render_band, self.bands(output_height)))
+
+        return TiledRenderResult(mapX, mapY, output, fixed_maps, self.tile_timings)
+
+    def report(self) -> str:
+        """One-line summary of the last render's per-tile timings"""
+        if not self.tile_timings:
+            return "No tiles rendered"
+        totals = [t.total_seconds for t in self.tile_timings]
+        return (f"{len(totals)} tiles on {self.workers} workers: "
+                f"mean {1000 * sum(totals) / len(totals):.1f} ms, max {1000 * max(totals):.1f} ms per tile")
@@ -0,0 +1,298 @@
+import glob
+import os
+import queue
+import re
+import threading
+import time
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+from models.image_io import IMAGE_EXTENSIONS, read_image, write_image
+from models.map_io import as_remap_maps
+
+# Marks the end of the frame stream in a stage queue
+_END = object()
+
+class FrameSource:
+    """Frames of a video file or of a numbered image sequence, in order"""
+    def __init__(self, path: str):
+        self.path = path
+        self.fps = 30.0
+        self._capture = None
+        self._files: Optional[List[str]] = None
+
+        if os.path.isdir(path):
+            names = sorted((n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS)), key=_natural_key)
+            self._files = [os.path.join(path, n) for n in names]
+        elif "%" in path:
+            self._files = _pattern_files(path)
+        elif "*" in path or "?" in path:
+            self._files = sorted(glob.glob(path), key=_natural_key)
+        else:
+            self._capture = cv2.VideoCapture(path)
+            if not self._capture.isOpened():
+                raise Exception(f"Failed to open video {path}")
+            self.fps = self._capture.get(cv2.CAP_PROP_FPS) or self.fps
+
+        if self._files is not None and not self._files:
+            raise Exception(f"No frames found for {path}")
+
+    @property
+    def frame_count(self) -> int:
+        if self._files is not None:
+            return len(self._files)
+        return int(self._capture.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    def frames(self) -> Iterator[np.ndarray]:
+        if self._files is not None:
+            for path in self._files:
+                yield read_image(path)
+            return
+        while True:
+            ok, frame = self._capture.read()
+            if not ok:
+                return
+            yield frame
+
+    def close(self):
+        if self._capture is not None:
+            self._capture.release()
+
+def _natural_key(name: str) -> list:
+    """f_2.png sorts before f_10.png"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+# The frame number conversion of a printf-style pattern: %d, %5d, %05d
+_FRAME_NUMBER = re.compile(r"%0?\d*d")
+
+def _pattern_files(pattern: str) -> List[str]:
+    """Files matching frame_%05d.png, ordered by frame number"""
+    match = _FRAME_NUMBER.search(pattern)
+    if match is None:
+        raise Exception(f"Expected a %d frame number in {pattern}")
+    head, tail = pattern[:match.start()], pattern[match.end():]
+    # Only names with digits where the number goes, unlike the frame_*.png glob
+    numbered = re.compile(re.escape(head) + r"(\d+)" + re.escape(tail))
+    files = []
+    for path in glob.glob(glob.escape(head) + "*" + glob.escape(tail)):
+        found = numbered.fullmatch(path)
+        if found:
+            files.append((int(found.group(1)), path))
+    return [path for _, path in sorted(files)]
+
+class FrameSink:
+    """Writes frames to a video file, a printf-style pattern or a directory of numbered images"""
+    def __init__(self, path: str, fps: float, fourcc: Optional[str] = None, extension: str = ".png"):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self._writer = None
+        self._pattern: Optional[str] = None
+        self._index = 0
+
+        if "%" in path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._pattern = path
+        elif os.path.isdir(path) or not os.path.splitext(path)[1]:
+            os.makedirs(path, exist_ok=True)
+            self._pattern = os.path.join(path, "frame_%06d" + extension)
+
+    def write(self, frame: np.ndarray):
+        if self._pattern is not None:
+            write_image(self._pattern % self._index, frame)
+        else:
+            if self._writer is None:
+                self._writer = self._open_writer(frame)
+            if frame.dtype != np.uint8:
+                raise Exception(f"Video output needs 8-bit frames, not {frame.dtype}; write an image sequence instead")
+            self._writer.write(frame)
+        self._index += 1
+
+    def _open_writer(self, frame: np.ndarray):
+        fourcc = self.fourcc or ("mp4v" if self.path.lower().endswith((".mp4", ".m4v", ".mov")) else "MJPG")
+        height, width = frame.shape[:2]
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*fourcc), self.fps, (width, height),
+                                 frame.ndim == 3)
+        if not writer.isOpened():
+            raise Exception(f"Failed to open video writer for {self.path} ({fourcc})")
+        return writer
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.release()
+
+@dataclass
+class StageStats:
+    """Work time of one pipeline stage and how full its output queue was"""
+    name: str
+    frames: int = 0
+    busy_seconds: float = 0.0
+    queue_samples: int = 0
+    queue_total: int = 0
+    queue_max: int = 0
+
+    def sample_queue(self, size: int):
+        self.queue_samples += 1
+        self.queue_total += size
+        self.queue_max = max(self.queue_max, size)
+
+    @property
+    def mean_queue(self) -> float:
+        return self.queue_total / self.queue_samples if self.queue_samples else 0.0
+
+    @property
+    def ms_per_frame(self) -> float:
+        return 1000.0 * self.busy_seconds / self.frames if self.frames else 0.0
+
+@dataclass
+class VideoStats:
+    frames: int = 0
+    seconds: float = 0.0
+    queue_size: int = 0
+    stages: List[StageStats] = field(default_factory=list)
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    def report(self) -> str:
+        lines = [f"{self.frames} frames in {self.seconds:.2f} s ({self.fps:.1f} fps)"]
+        for stage in self.stages:
+            lines.append(f"  {stage.name:<7}{stage.ms_per_frame:7.2f} ms/frame, output queue "
+                         f"{stage.mean_queue:.1f} avg / {stage.queue_max} max of {self.queue_size}")
+        return "\n".join(lines)
+
+class VideoWarper:
+    """Decode -> remap -> encode pipeline with one thread per stage
+
+    The stages are connected by bounded queues so a slow stage applies
+    backpressure instead of buffering the whole video. The maps are
+    converted to fixed-point once and reused for every frame; decoding,
+    cv2.remap and encoding all release the GIL, so the stages overlap.
+    """
+    def __init__(self, mapX: np.ndarray, mapY: np.ndarray, fixed_point: bool = True, queue_size: int = 8):
+        self.maps = as_remap_maps(mapX, mapY, fixed_point)
+        self.queue_size = queue_size
+
+    def run(self, source: FrameSource, sink: FrameSink,
+            on_progress: Optional[Callable[[VideoStats], None]] = None) -> VideoStats:
+        decoded: queue.Queue = queue.Queue(self.queue_size)
+        warped: queue.Queue = queue.Queue(self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        stats = VideoStats(queue_size=self.queue_size,
+                           stages=[StageStats("decode"), StageStats("remap"), StageStats("encode")])
+        decode_stats, remap_stats, encode_stats = stats.stages
+        start = time.perf_counter()
+
+        def put(q: queue.Queue, item) -> bool:
+            # Blocks while the queue is full, but gives up once another stage failed
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _END
+
+        def decode():
+            frames = source.frames()
+            while True:
+                t = time.perf_counter()
+                frame = next(frames, _END)
+                if frame is _END:
+                    break
+                decode_stats.busy_seconds += time.perf_counter() - t
+                decode_stats.frames += 1
+                decode_stats.sample_queue(decoded.qsize())
+                if not put(decoded, frame):
+                    return
+            put(decoded, _END)
+
+        def remap():
+            map1, map2 = self.maps
+            while True:
+                frame = get(decoded)
+                if frame is _END:
+                    break
+                t = time.perf_counter()
+                output = cv2.remap(frame, map1, map2, cv2.INTER_LINEAR)
+                remap_stats.busy_seconds += time.perf_counter() - t
+                remap_stats.frames += 1
+                remap_stats.sample_queue(warped.qsize())
+                if not put(warped, output):
+                    return
+            put(warped, _END)
+
+        def encode():
+            while True:
+                frame = get(warped)
+                if frame is _END:
+                    break
+                t = time.perf_counter()
+                sink.write(frame)
+                encode_stats.busy_seconds += time.perf_counter() - t
+                encode_stats.frames += 1
+                stats.frames = encode_stats.frames
+                stats.seconds = time.perf_counter() - start
+                if on_progress:
+                    on_progress(stats)
+
+        def guarded(stage: Callable[[], None]) -> Callable[[], None]:
+            def run_stage():
+                try:
+                    stage()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            return run_stage
+
+        threads = [threading.Thread(target=guarded(stage), name=f"video-{stage.__name__}", daemon=True)
+                   for stage in (decode, remap, encode)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            raise
+
+        stats.seconds = time.perf_counter() - start
+        if errors:
+            raise errors[0]
+        return stats
+
+def warp_video(mapX: np.ndarray, mapY: np.ndarray, input_path: str, output_path: str,
+               fixed_point: bool = True, queue_size: int = 8, fourcc: Optional[str] = None,
+               on_progress: Optional[Callable[[VideoStats], None]] = None) -> VideoStats:
+    """Warp every frame of a video or image sequence with the same maps"""
+    source = FrameSource(input_path)
+    sink = FrameSink(output_path, source.fps, fourcc)
+    try:
+        return VideoWarper(mapX, mapY, fixed_point, queue_size).run(source, sink, on_progress)
+    finally:
+        source.close()
+        sink.close()
+
+def frame_size(input_path: str) -> Tuple[int, int]:
+    """(width, height) of the first frame"""
+    source = FrameSource(input_path)
+    try:
+        frame = next(source.frames(), None)
+    finally:
+        source.close()
+    if frame is None:
+        raise Exception(f"No frames in {input_path}")
+    return frame.shape[1], frame.shape[0]
@@ -0,0 +1,259 @@
+import math
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from models.interpolation import INTERPOLATION_MODES, InterpolationTableCache
+
+class WarpBackend(ABC):
+    """Turns a (rows+1, cols+1, 2) control grid into mapX/mapY for cv2.remap"""
+    name = "base"
+    # Exact backends reproduce the reference mapping to float32 precision
+    exact = True
+    interpolations: Tuple[str, ...] = INTERPOLATION_MODES
+
+    def __init__(self, table_cache: Optional[InterpolationTableCache] = None):
+        self.table_cache = table_cache if table_cache is not None else InterpolationTableCache()
+
+    def supports(self, rows: int, cols: int, output_width: int, output_height: int,
+                 interpolation: str = "bilinear") -> bool:
+        return interpolation in self.interpolations
+
+    @abstractmethod
+    def compute_maps(self, points: np.ndarray, output_width: int, output_height: int,
+                     interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        """mapX/mapY (float32, output_height x output_width) for the whole output"""
+
+    def max_error(self, points: np.ndarray, output_width: int, output_height: int) -> float:
+        """Upper bound, in pixels, on how far these maps may be from the reference mapping"""
+        return 0.0
+
+    def compute_region(self, points: np.ndarray, output_width: int, output_height: int,
+                       rect: Tuple[int, int, int, int], interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        """mapX/mapY for the output rectangle (x_start, y_start, x_stop, y_stop) only"""
+        x_start, y_start, x_stop, y_stop = rect
+        mapX, mapY = self.compute_maps(points, output_width, output_height, interpolation)
+        return mapX[y_start:y_stop, x_start:x_stop], mapY[y_start:y_stop, x_start:x_stop]
+
+class NumpyWarpBackend(WarpBackend):
+    """Separable gather-and-blend over the control grid (reference backend)"""
+    name = "numpy"
+
+    def compute_maps(self, points: np.ndarray, output_width: int, output_height: int,
+                     interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        return self.compute_region(points, output_width, output_height,
+                                   (0, 0, output_width, output_height), interpolation)
+
+    def compute_region(self, points: np.ndarray, output_width: int, output_height: int,
+                       rect: Tuple[int, int, int, int], interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        points = np.asarray(points, dtype=np.float32)
+        rows, cols = points.shape[0] - 1, points.shape[1] - 1
+        x_start, y_start, x_stop, y_stop = rect
+
+        # Tap indices and weights for every output column and row
+        t = self.table_cache.get_tables(rows, cols, output_width, output_height, interpolation)
+        x_index, x_weight = t.x_index[:, x_start:x_stop], t.x_weight[:, x_start:x_stop]
+        y_index, y_weight = t.y_index[:, y_start:y_stop], t.y_weight[:, y_start:y_stop]
+
+        # Interpolate along x for every control row: (rows+1, width, 2)
+        row_interp = x_weight[0][None, :, None] * points[:, x_index[0]]
+        for k in range(1, len(x_index)):
+            row_interp += x_weight[k][None, :, None] * points[:, x_index[k]]
+
+        # Interpolate along y between the control rows around each output row
+        maps = []
+        for channel in range(2):
+            values = row_interp[:, :, channel]
+            out = y_weight[0][:, None] * values[y_index[0]]
+            for k in range(1, len(y_index)):
+                out += y_weight[k][:, None] * values[y_index[k]]
+            maps.append(out)
+
+        return maps[0], maps[1]
+
+class MatmulWarpBackend(WarpBackend):
+    """Separable interpolation as two dense matrix products (uses BLAS threads)"""
+    name = "matmul"
+
+    def supports(self, rows: int, cols: int, output_width: int, output_height: int,
+                 interpolation: str = "bilinear") -> bool:
+        # Dense products cost O(rows) per output pixel, so only pay off on coarse grids
+        return rows <= 32 and super().supports(rows, cols, output_width, output_height, interpolation)
+
+    def compute_maps(self, points: np.ndarray, output_width: int, output_height: int,
+                     interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        return self.compute_region(points, output_width, output_height,
+                                   (0, 0, output_width, output_height), interpolation)
+
+    def compute_region(self, points: np.ndarray, output_width: int, output_height: int,
+                       rect: Tuple[int, int, int, int], interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        points = np.asarray(points, dtype=np.float32)
+        rows, cols = points.shape[0] - 1, points.shape[1] - 1
+        x_start, y_start, x_stop, y_stop = rect
+        wx, wy = self.table_cache.get_weight_matrices(rows, cols, output_width, output_height, interpolation)
+        wx, wy = wx[x_start:x_stop], wy[y_start:y_stop]
+        mapX = wy @ (points[:, :, 0] @ wx.T)
+        mapY = wy @ (points[:, :, 1] @ wx.T)
+        return mapX, mapY
+
+class OpenCVWarpBackend(WarpBackend):
+    """Upsamples the control grid straight to output size with cv2.resize
+
+    cv2.resize samples at pixel centres, while the mesh maps output pixel j to
+    grid position j*cols/width. Scaling by exactly width/cols gives the right
+    spacing; the remaining sub-pixel phase is folded into the resampled nodes
+    and a small crop. That moves every control line by up to one output pixel,
+    so the result is exact inside cells but wrong by up to the change in
+    slope across a control line: see max_error(). On meshes jittered by a
+    few pixels per point this is 0.1-2 px, far above cv2.remap's 1/32 px,
+    hence exact = False and the "approx" label.
+    """
+    name = "opencv-approx"
+    exact = False
+    interpolations = ("bilinear",)
+
+    @staticmethod
+    def _phase(cells: int, size: int) -> Tuple[int, float]:
+        """Output crop offset and node shift (in cells) that align cv2.resize with the mesh"""
+        delta = 0.5 - 0.5 * cells / size
+        offset = int(math.ceil(delta * size / cells - 1e-9))
+        shift = offset * cells / size - delta
+        return offset, shift
+
+    @staticmethod
+    def _shift_nodes(points: np.ndarray, shift: float, axis: int) -> np.ndarray:
+        """Evaluate the piecewise-linear grid at node positions p - shift along axis"""
+        points = np.moveaxis(points, axis, 0)
+        previous = np.concatenate([2 * points[:1] - points[1:2], points[:-1]], axis=0)
+        shifted = (1 - shift) * points + shift * previous
+        return np.moveaxis(shifted, 0, axis)
+
+    def max_error(self, points: np.ndarray, output_width: int, output_height: int) -> float:
+        """(cols/width) * largest second difference along rows, plus the same down columns"""
+        points = np.asarray(points, dtype=np.float64)
+        rows, cols = points.shape[0] - 1, points.shape[1] - 1
+        error = 0.0
+        if cols > 1:
+            bend = np.abs(points[:, 2:] - 2 * points[:, 1:-1] + points[:, :-2]).max()
+            error += cols / output_width * float(bend)
+        if rows > 1:
+            bend = np.abs(points[2:] - 2 * points[1:-1] + points[:-2]).max()
+            error += rows / output_height * float(bend)
+        return error
+
+    def supports(self, rows: int, cols: int, output_width: int, output_height: int,
+                 interpolation: str = "bilinear") -> bool:
+        return (output_width >= cols and output_height >= rows
+                and super().supports(rows, cols, output_width, output_height, interpolation))
+
+    def compute_maps(self, points: np.ndarray, output_width: int, output_height: int,
+                     interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        # Imported on first use so mesh editing and map generation work without loading OpenCV
+        import cv2
+        points = np.asarray(points, dtype=np.float64)
+        rows, cols = points.shape[0] - 1, points.shape[1] - 1
+        off_x, shift_x = self._phase(cols, output_width)
+        off_y, shift_y = self._phase(rows, output_height)
+
+        nodes = self._shift_nodes(self._shift_nodes(points, shift_x, 1), shift_y, 0).astype(np.float32)
+        maps = []
+        for channel in range(2):
+            dense = cv2.resize(np.ascontiguousarray(nodes[:, :, channel]), None,
+                               fx=output_width / cols, fy=output_height / rows,
+                               interpolation=cv2.INTER_LINEAR)
+            dense = dense[off_y:off_y + output_height, off_x:off_x + output_width]
+            if dense.shape != (output_height, output_width):
+                raise Exception(f"cv2.resize produced {dense.shape[1]}x{dense.shape[0]}, "
+                                f"expected {output_width}x{output_height}")
+            maps.append(dense)
+
+        return maps[0], maps[1]
+
+def default_backends(table_cache: Optional[InterpolationTableCache] = None) -> List[WarpBackend]:
+    """All built-in backends; the first one is the reference implementation"""
+    if table_cache is None:
+        table_cache = InterpolationTableCache()
+    return [NumpyWarpBackend(table_cache), MatmulWarpBackend(table_cache), OpenCVWarpBackend(table_cache)]
+
+class WarpEngine:
+    """Computes remap maps with the fastest backend that is accurate enough"""
+    def __init__(self, backends: Optional[List[WarpBackend]] = None, allow_approximate: bool = False,
+                 tolerance: float = 1.0 / 32, calibration_pixels: int = 1_000_000,
+                 table_cache: Optional[InterpolationTableCache] = None):
+        self.table_cache = table_cache if table_cache is not None else InterpolationTableCache()
+        self.backends = backends if backends is not None else default_backends(self.table_cache)
+        self.reference = self.backends[0]
+        self.backend = self.reference
+        # Approximate backends are only verified on the calibration mesh, so they are opt-in
+        self.allow_approximate = allow_approximate
+        # cv2.remap resolves map coordinates to 1/32 pixel, so smaller errors are invisible
+        self.tolerance = tolerance
+        self.calibration_pixels = calibration_pixels
+        self.timings: Dict[str, float] = {}
+
+    def calibrate(self, points: np.ndarray, output_width: int, output_height: int, repeats: int = 2,
+                  interpolation: str = "bilinear") -> WarpBackend:
+        """Time every backend on the given grid and output size and select the fastest"""
+        rows, cols = points.shape[0] - 1, points.shape[1] - 1
+
+        # Keep calibration cheap on large outputs while preserving the aspect ratio
+        scale = min(1.0, (self.calibration_pixels / float(output_width * output_height)) ** 0.5)
+        width = max(cols, int(output_width * scale))
+        height = max(rows, int(output_height * scale))
+
+        reference_maps = None
+        self.timings = {}
+        for backend in self.backends:
+            if not backend.supports(rows, cols, width, height, interpolation):
+                continue
+            if not backend.exact and not self.allow_approximate:
+                continue
+            try:
+                best = float('inf')
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    maps = backend.compute_maps(points, width, height, interpolation)
+                    best = min(best, time.perf_counter() - start)
+            except Exception:
+                continue
+
+            if reference_maps is None:
+                reference_maps = maps
+            elif not backend.exact:
+                error = max(float(np.abs(maps[0] - reference_maps[0]).max()),
+                            float(np.abs(maps[1] - reference_maps[1]).max()))
+                if error > self.tolerance:
+                    continue
+            self.timings[backend.name] = best
+
+        if self.timings:
+            fastest = min(self.timings, key=self.timings.get)
+            self.backend = next(b for b in self.backends if b.name == fastest)
+        return self.backend
+
+    def select_backend(self, rows: int, cols: int, output_width: int, output_height: int,
+                       interpolation: str = "bilinear") -> WarpBackend:
+        """The calibrated backend, or the reference one if it cannot handle the request"""
+        if self.backend.supports(rows, cols, output_width, output_height, interpolation):
+            return self.backend
+        return self.reference
+
+    def _backend_for(self, points: np.ndarray, output_width: int, output_height: int,
+                     interpolation: str) -> WarpBackend:
+        backend = self.select_backend(points.shape[0] - 1, points.shape[1] - 1, output_width, output_height, interpolation)
+        # Calibration only checked an approximate backend on the mesh of that moment
+        if not backend.exact and backend.max_error(points, output_width, output_height) > self.tolerance:
+            return self.reference
+        return backend
+
+    def compute_maps(self, points: np.ndarray, output_width: int, output_height: int,
+                     interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        """Generate mapX and mapY for cv2.remap with the selected backend"""
+        backend = self._backend_for(points, output_width, output_height, interpolation)
+        return backend.compute_maps(points, output_width, output_height, interpolation)
+
+    def compute_region(self, points: np.ndarray, output_width: int, output_height: int,
+                       rect: Tuple[int, int, int, int], interpolation: str = "bilinear") -> Tuple[np.ndarray, np.ndarray]:
+        """Generate mapX and mapY for one output rectangle with the selected backend"""
+        backend = self._backend_for(points, output_width, output_height, interpolation)
+        return backend.compute_region(points, output_width, output_height, rect, interpolation)
@@ -1,3 +1,3 @@
-from .image_utils import load_grayscale_image, create_tk_image, display_image, get_canvas_size
+from .image_utils import load_grayscale_image, to_display_8bit, create_tk_image, display_image, place_image, get_canvas_size
 
-__all__ = ['load_grayscale_image', 'create_tk_image', 'display_image', 'get_canvas_size']
+__all__ = ['load_grayscale_image', 'to_display_8bit', 'create_tk_image', 'display_image', 'place_image', 'get_canvas_size']
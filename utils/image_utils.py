@@ -1,6 +1,5 @@
 import cv2
 import numpy as np
-from PIL import Image, ImageTk
 import tkinter as tk
 from typing import Tuple
 
@@ -11,25 +10,48 @@ def load_grayscale_image(filepath: str) -> np.ndarray:
         raise Exception(f"Failed to load image from {filepath}")
     return image
 
-def create_tk_image(image: np.ndarray) -> ImageTk.PhotoImage:
+def to_display_8bit(image: np.ndarray) -> np.ndarray:
+    """8-bit grayscale, RGB or RGBA version of an image (or region) for display"""
+    if image.dtype == np.uint16:
+        image = (image >> 8).astype(np.uint8)
+    elif np.issubdtype(image.dtype, np.floating):
+        # Float images are expected in [0, 1]
+        image = np.clip(image * 255.0, 0, 255).astype(np.uint8)
+    elif image.dtype != np.uint8:
+        info = np.iinfo(image.dtype)
+        image = ((image.astype(np.float32) - info.min) * (255.0 / (info.max - info.min))).astype(np.uint8)
+
+    if image.ndim == 3 and image.shape[2] == 1:
+        image = image[:, :, 0]
+    elif image.ndim == 3 and image.shape[2] == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    elif image.ndim == 3 and image.shape[2] == 4:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
+    return image
+
+def create_tk_image(image: np.ndarray) -> 'ImageTk.PhotoImage':
     """Convert OpenCV image to Tkinter PhotoImage"""
-    # Convert OpenCV grayscale image to PIL format
-    image_pil = Image.fromarray(image).convert('L')
+    # PIL is only needed once something is shown, not when the module is imported
+    from PIL import Image, ImageTk
+    # Convert OpenCV image (any depth, gray or BGR/BGRA) to PIL format
+    image_pil = Image.fromarray(to_display_8bit(image))
     # Convert PIL image to PhotoImage
     return ImageTk.PhotoImage(image=image_pil)
 
-def display_image(image: np.ndarray, canvas: tk.Canvas) -> ImageTk.PhotoImage:
-    """Display an image on a canvas and return the PhotoImage"""
-    h, w = image.shape[:2]
+def display_image(image: np.ndarray, canvas: tk.Canvas, x: int = 0, y: int = 0) -> 'ImageTk.PhotoImage':
+    """Display an image on a canvas with its top-left corner at (x, y) and return the PhotoImage"""
     photo = create_tk_image(image)
-    
+    place_image(photo, canvas, x, y)
+    return photo  # Return to prevent garbage collection
+
+def place_image(photo: 'ImageTk.PhotoImage', canvas: tk.Canvas, x: int = 0, y: int = 0):
+    """Replace the canvas image item with photo, top-left corner at (x, y)"""
     # Clear previous image
     canvas.delete("image")
     
-    # Create image centered in canvas
-    canvas.create_image(w//2, h//2, anchor=tk.CENTER, image=photo, tags="image")
-    
-    return photo  # Return to prevent garbage collection
+    # Create image below any overlays such as the mesh
+    canvas.create_image(x, y, anchor=tk.NW, image=photo, tags="image")
+    canvas.tag_lower("image")
 
 def get_canvas_size(canvas: tk.Canvas) -> Tuple[int, int]:
     """Get the current size of a canvas"""
@@ -0,0 +1,39 @@
+import argparse
+import sys
+from batch_warp import parse_size
+from models.batch import load_batch_maps
+from models.video import frame_size, warp_video
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a saved mesh or maps to every frame of a video")
+    parser.add_argument("mesh", help="mesh .json or .mesh (as saved by the GUI), or maps .npz/.npy in any export format")
+    parser.add_argument("input", help="video file, directory of frames, or pattern such as frames/%%05d.png")
+    parser.add_argument("output", help="video file, directory, or pattern such as out/%%05d.png")
+    parser.add_argument("--size", type=parse_size, help="output size WxH (default: size of the frames)")
+    parser.add_argument("--fourcc", help="video codec, e.g. mp4v or MJPG (default: from the extension)")
+    parser.add_argument("--queue", type=int, default=8, help="frames buffered between stages")
+    parser.add_argument("--float-maps", action="store_true", help="remap with float maps instead of fixed-point")
+    parser.add_argument("--progress", type=int, default=100, help="print stats every N frames (0 to disable)")
+    args = parser.parse_args(argv)
+
+    image_size = None
+    if args.size is None and not args.mesh.lower().endswith((".npz", ".npy")):
+        image_size = frame_size(args.input)
+    width, height = args.size if args.size else (None, None)
+    mapX, mapY = load_batch_maps(args.mesh, width, height, image_size)
+
+    def on_progress(stats):
+        if args.progress and stats.frames % args.progress == 0:
+            print(stats.report(), flush=True)
+
+    try:
+        stats = warp_video(mapX, mapY, args.input, args.output, not args.float_maps, args.queue,
+                           args.fourcc, on_progress)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(stats.report())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,76 @@ import cv2
 import numpy as np
 import json
 import os
-from typing import Optional, Tuple, Callable
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple, Callable, Dict, Set, List
 from models.mesh_grid import MeshGrid, MeshPoint
+from models.warp_engine import WarpEngine
+from models.tiled_remap import TiledRemapper
+from models.streaming import StreamingRenderer, open_image_source
+from models.inverse_map import compute_inverse_maps
+from viewmodels.render_scheduler import RenderScheduler
+from models.mesh_history import MeshHistory
+from models.render_cache import RenderCache, mesh_key
+from models.disk_cache import DiskMapCache
+from models.image_io import read_image, write_image
+from models.mesh_io import load_mesh, save_mesh
+from models.map_io import is_fixed_point_maps, load_maps, save_maps
+from models.metrics import RenderMetrics, RenderProfiler, SpanStats
+
+class RenderJob:
+    """Immutable snapshot of one render; calling it computes maps and pixels without touching the view model"""
+    def __init__(self, vm: 'MeshWarpViewModel', points: np.ndarray, image: np.ndarray,
+                 render_key: Tuple[int, int, int, int, str], rects: Optional[List[Tuple[int, int, int, int]]],
+                 fixed_point: bool, tiled: bool):
+        self.warp_engine = vm.warp_engine
+        self.tiled_remapper = vm.tiled_remapper
+        self.points = points
+        self.image = image
+        self.render_key = render_key
+        # None renders the whole output, otherwise only these rectangles
+        self.rects = rects
+        self.fixed_point = fixed_point
+        self.tiled = tiled
+        self.metrics = vm.metrics
+        self.profiler = vm.profiler
+
+    def __call__(self) -> tuple:
+        if self.profiler is None:
+            return self._render()
+        with self.profiler.capture():
+            return self._render()
+
+    def _render(self) -> tuple:
+        _, _, output_width, output_height, interpolation = self.render_key
+        metrics = self.metrics
+        with metrics.span("render"):
+            if self.rects is None:
+                if self.tiled:
+                    result = self.tiled_remapper.render(self.warp_engine, self.points, self.image, output_width,
+                                                        output_height, self.fixed_point, interpolation)
+                    # Bands overlap in time, so these are summed over worker threads
+                    metrics.record("maps", sum(t.map_seconds for t in result.tile_timings))
+                    metrics.record("remap", sum(t.remap_seconds for t in result.tile_timings))
+                    output = result.mapX, result.mapY, result.fixed_maps, result.output
+                else:
+                    with metrics.span("maps"):
+                        mapX, mapY = self.warp_engine.compute_maps(self.points, output_width, output_height,
+                                                                   interpolation)
+                    with metrics.span("remap"):
+                        pixels, fixed_maps = MeshWarpViewModel._remap(self.image, mapX, mapY, self.fixed_point)
+                    output = mapX, mapY, fixed_maps, pixels
+                return output
+
+            patches = []
+            for rect in self.rects:
+                with metrics.span("maps"):
+                    mapX, mapY = self.warp_engine.compute_region(self.points, output_width, output_height, rect,
+                                                                 interpolation)
+                with metrics.span("remap"):
+                    pixels, fixed_maps = MeshWarpViewModel._remap(self.image, mapX, mapY, self.fixed_point)
+                patches.append((rect, mapX, mapY, fixed_maps, pixels))
+            return patches
 
 class MeshWarpViewModel:
     def __init__(self):
@@ -12,25 +80,73 @@ class MeshWarpViewModel:
         self.mesh_grid: Optional[MeshGrid] = None
         self.mapX: Optional[np.ndarray] = None
         self.mapY: Optional[np.ndarray] = None
+        self.warp_engine = WarpEngine()
+        
+        # Packed fixed-point maps (CV_16SC2 + interpolation table) derived from mapX/mapY
+        self.use_fixed_point_maps = False
+        self.fixed_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        
+        # Full renders can be split into horizontal bands processed on a thread pool
+        self.use_tiled_render = False
+        self.tiled_remapper = TiledRemapper()
+        
+        # Control points moved since the last render; None forces a full render
+        self._dirty_points: Optional[Set[Tuple[int, int]]] = None
+        self._render_key: Optional[Tuple[int, int, int, int, str]] = None
+        # Re-render everything once the dirty area exceeds this fraction of the output
+        self.max_dirty_fraction = 0.5
+        
+        # Full renders can run on a worker thread; results are posted back through the scheduler's dispatch
+        self.render_in_background = False
+        self.render_scheduler = RenderScheduler()
+        # Streaming renders take minutes on huge images, so they get their own worker
+        self._stream_executor: Optional[ThreadPoolExecutor] = None
+        self._streaming: Optional[Future] = None
+        self._stream_stop = threading.Event()
+        
+        # Interactive previews render at this fraction of the output resolution
+        self.preview_scale = 0.25
+        
+        # Named stage timings (maps, remap, display and the view's own spans) and optional
+        # per-render cProfile/tracemalloc dumps
+        self.metrics = RenderMetrics()
+        self.profiler: Optional[RenderProfiler] = None
+        
+        # Undo/redo of point moves; one drag gesture is one edit
+        self.history = MeshHistory()
+        # Rendered mesh states by content hash, so revisiting one (undo, reloading a mesh, switching
+        # back to an output size) reinstalls its maps instead of rendering
+        self.render_cache = RenderCache()
+        # Optional persistent map cache shared across sessions (maps are memory-mapped back in)
+        self.disk_cache: Optional[DiskMapCache] = None
+        # Path of the loaded image, recorded in session files
+        self.image_path: Optional[str] = None
+        # True while the current maps/output are also held by the cache and must be copied before patching
+        self._render_shared = False
         
         # Callbacks for view updates
         self.on_input_image_changed: Optional[Callable[[np.ndarray], None]] = None
         self.on_output_image_changed: Optional[Callable[[np.ndarray], None]] = None
         self.on_mesh_updated: Optional[Callable[[], None]] = None
         self.on_status_changed: Optional[Callable[[str], None]] = None
+        # Rolling per-stage timings, reported after every displayed render
+        self.on_metrics: Optional[Callable[[Dict[str, SpanStats]], None]] = None
 
     def load_image(self, filepath: str) -> bool:
         try:
-            image = cv2.imread(filepath, cv2.IMREAD_GRAYSCALE)
-            if image is None:
-                raise Exception(f"Failed to load image from {filepath}")
+            # Native channels and bit depth; every channel is warped by the same remap call
+            image = read_image(filepath)
             
             self.input_image = image
+            self.image_path = filepath
+            self.render_cache.clear()
+            self._reset_edit_state()
             if self.on_input_image_changed:
                 self.on_input_image_changed(self.input_image)
                 
             self.initialize_mesh_grid()
-            self.update_output_image()  # Update output image immediately after loading
+            self.calibrate_warp_engine()
+            self.request_output_update()  # Update output image immediately after loading
             return True
         except Exception as e:
             if self.on_status_changed:
@@ -42,7 +158,10 @@ class MeshWarpViewModel:
             return
             
         h, w = self.input_image.shape[:2]
+        interpolation = self.mesh_grid.interpolation if self.mesh_grid is not None else "bilinear"
         self.mesh_grid = MeshGrid(rows, cols, h, w)
+        self.mesh_grid.set_interpolation(interpolation)
+        self._reset_edit_state()
         
         if self.on_mesh_updated:
             self.on_mesh_updated()
@@ -52,12 +171,49 @@ class MeshWarpViewModel:
             return
             
         h, w = self.input_image.shape[:2]
+        interpolation = self.mesh_grid.interpolation if self.mesh_grid is not None else "bilinear"
         self.mesh_grid = MeshGrid(rows, cols, h, w)
+        self.mesh_grid.set_interpolation(interpolation)
+        self._reset_edit_state()
         
         if self.on_mesh_updated:
             self.on_mesh_updated()
         
-        self.update_output_image()
+        self.calibrate_warp_engine()
+        self.request_output_update()
+
+    def _reset_edit_state(self):
+        """Forget incremental render state and history after the image or mesh is replaced"""
+        self._dirty_points = None
+        self.history.clear()
+
+    def set_interpolation(self, interpolation: str):
+        """Switch the mesh between bilinear and spline interpolation and re-render"""
+        if self.mesh_grid is None:
+            return
+            
+        try:
+            self.mesh_grid.set_interpolation(interpolation)
+        except Exception as e:
+            if self.on_status_changed:
+                self.on_status_changed(f"Error setting interpolation: {e}")
+            return
+            
+        self.calibrate_warp_engine()
+        self.request_output_update()
+
+    def calibrate_warp_engine(self, output_width: Optional[int] = None, output_height: Optional[int] = None):
+        """Pick the fastest map backend for the current image and grid size"""
+        if self.input_image is None or self.mesh_grid is None:
+            return
+
+        if output_width is None:
+            output_width = self.input_image.shape[1]
+        if output_height is None:
+            output_height = self.input_image.shape[0]
+
+        self.warp_engine.calibrate(self.mesh_grid.get_points_array(), output_width, output_height,
+                                   interpolation=self.mesh_grid.interpolation)
 
     def move_point(self, row: int, col: int, x: int, y: int):
         if self.mesh_grid is None:
@@ -67,25 +223,298 @@ class MeshWarpViewModel:
         x = max(0, min(x, w - 1))
         y = max(0, min(y, h - 1))
         
+        old = self.mesh_grid.get_points_array()[row, col].tolist()
         self.mesh_grid.set_point(row, col, x, y)
+        self.history.record(row * (self.mesh_grid.cols + 1) + col, tuple(old), (float(x), float(y)))
+        if self._dirty_points is not None:
+            self._dirty_points.add((row, col))
+        
+        if self.on_mesh_updated:
+            self.on_mesh_updated()
+
+    def begin_edit(self):
+        """Start a gesture; point moves until end_edit() are undone as one step"""
+        self._remember_render()
+        self.history.begin_gesture()
+
+    def end_edit(self):
+        self.history.end_gesture()
+
+    def undo(self) -> bool:
+        if self.mesh_grid is None or not self.history.can_undo:
+            return False
+        self._remember_render()
+        edit = self.history.undo()
+        self._apply_edit(edit.indices, edit.old)
+        if self.on_status_changed:
+            self.on_status_changed(f"Undid move of {len(edit.indices)} point(s)")
+        return True
+
+    def redo(self) -> bool:
+        if self.mesh_grid is None or not self.history.can_redo:
+            return False
+        self._remember_render()
+        edit = self.history.redo()
+        self._apply_edit(edit.indices, edit.new)
+        if self.on_status_changed:
+            self.on_status_changed(f"Redid move of {len(edit.indices)} point(s)")
+        return True
+
+    def _apply_edit(self, indices: np.ndarray, coords: np.ndarray):
+        for index, (x, y) in zip(indices.tolist(), coords.tolist()):
+            row, col = divmod(index, self.mesh_grid.cols + 1)
+            self.mesh_grid.set_point(row, col, x, y)
+            if self._dirty_points is not None:
+                self._dirty_points.add((row, col))
         
         if self.on_mesh_updated:
             self.on_mesh_updated()
+        self.request_output_update()
 
     def update_output_image(self, output_width: Optional[int] = None, output_height: Optional[int] = None):
         if self.input_image is None or self.mesh_grid is None:
             return
-            
+
+        # A synchronous render supersedes anything the background worker is doing
+        if self.render_scheduler.cancel():
+            self._dirty_points = None
+        if not self._restore_cached_render(output_width, output_height):
+            job = self._prepare_render(output_width, output_height)
+            self._apply_render(job, job())
+        
+        self._show_output()
+
+    def request_output_update(self, output_width: Optional[int] = None, output_height: Optional[int] = None):
+        """Render on the background worker if enabled, otherwise synchronously
+
+        Requests made while a render is running are coalesced; only the
+        newest completed render reaches on_output_image_changed. The output
+        size defaults to the input image size, as in update_output_image.
+        """
+        if not self.render_in_background:
+            self.update_output_image(output_width, output_height)
+            return
+        if (self.input_image is not None and self.mesh_grid is not None
+                and self._restore_cached_render(output_width, output_height)):
+            if self.render_scheduler.cancel():
+                # The cached state is complete, so the dropped job leaves nothing dirty
+                self._dirty_points = set()
+            self._show_output()
+            return
+        self.render_scheduler.request(lambda: self._snapshot_render(output_width, output_height),
+                                      self._finish_background_render)
+
+    def _snapshot_render(self, output_width: Optional[int] = None,
+                         output_height: Optional[int] = None) -> Optional[Callable[[], object]]:
+        if self.input_image is None or self.mesh_grid is None:
+            return None
+        job = self._prepare_render(output_width, output_height)
+        return lambda: (job, job())
+
+    def _finish_background_render(self, result, superseded: bool):
+        if isinstance(result, Exception):
+            self._dirty_points = None
+            if self.on_status_changed:
+                self.on_status_changed(f"Error rendering output: {result}")
+            return
+        job, output = result
+        self._apply_render(job, output)
+        if not superseded:
+            self._show_output()
+
+    def _show_output(self):
+        """Hand the output to the view, then report stage timings including the view's"""
+        if self.on_output_image_changed:
+            with self.metrics.span("display"):
+                self.on_output_image_changed(self.output_image)
+        if self.on_metrics:
+            self.on_metrics(self.metrics.stats())
+
+    def enable_profiling(self, directory: Optional[str]):
+        """Dump cProfile and tracemalloc snapshots of every render to directory (None turns it off)"""
+        self.profiler = RenderProfiler(directory) if directory else None
+
+    def _prepare_render(self, output_width: Optional[int] = None, output_height: Optional[int] = None) -> 'RenderJob':
+        """Snapshot everything a render needs; the returned job is safe to run on another thread"""
         if output_width is None:
             output_width = self.input_image.shape[1]
         if output_height is None:
             output_height = self.input_image.shape[0]
 
-        self.mapX, self.mapY = self.mesh_grid.get_maps(output_width, output_height)
-        self.output_image = cv2.remap(self.input_image, self.mapX, self.mapY, cv2.INTER_LINEAR)
+        points = self.mesh_grid.get_points_array().copy()
+        points.flags.writeable = False
+        interpolation = self.mesh_grid.interpolation
+        render_key = (self.mesh_grid.rows, self.mesh_grid.cols, output_width, output_height, interpolation)
+        rects = None
+        if self._dirty_points is not None and render_key == self._render_key:
+            rects = self._dirty_rects(output_width, output_height)
+        # Points moved from now on belong to the next render
+        self._dirty_points = set()
+        return RenderJob(self, points, self.input_image, render_key, rects,
+                         self.use_fixed_point_maps, self.use_tiled_render)
+
+    def _apply_render(self, job: 'RenderJob', output: tuple):
+        """Install a finished render's maps and pixels (UI thread only)"""
+        with self.metrics.span("apply"):
+            self._install_render(job, output)
+
+    def _install_render(self, job: 'RenderJob', output: tuple):
+        if job.rects is None:
+            self.mapX, self.mapY, self.fixed_maps, self.output_image = output
+            _, _, output_width, output_height, interpolation = job.render_key
+            self.render_cache.put(mesh_key(job.points, output_width, output_height, interpolation, job.fixed_point),
+                                  output)
+            self._render_shared = True
+            if self.disk_cache is not None:
+                # Written in the background; the maps are never patched in place once cached (copy on write)
+                self.disk_cache.put_async(mesh_key(job.points, output_width, output_height, interpolation),
+                                          self.mapX, self.mapY)
+        else:
+            if self._render_shared:
+                # Copy on write: the cache keeps the arrays of the earlier state
+                self.mapX, self.mapY, self.output_image = self.mapX.copy(), self.mapY.copy(), self.output_image.copy()
+                if self.fixed_maps is not None:
+                    self.fixed_maps = (self.fixed_maps[0].copy(), self.fixed_maps[1].copy())
+                self._render_shared = False
+            for (x0, y0, x1, y1), mapX, mapY, fixed_maps, pixels in output:
+                self.mapX[y0:y1, x0:x1] = mapX
+                self.mapY[y0:y1, x0:x1] = mapY
+                if self.fixed_maps is not None:
+                    self.fixed_maps[0][y0:y1, x0:x1] = fixed_maps[0]
+                    self.fixed_maps[1][y0:y1, x0:x1] = fixed_maps[1]
+                self.output_image[y0:y1, x0:x1] = pixels
+        self._render_key = job.render_key
+
+    def _remember_render(self):
+        """Cache the current render if it matches the mesh exactly (it was patched since it was stored)"""
+        if (self.mesh_grid is None or self.output_image is None or self._render_key is None
+                or self._dirty_points is None or self._dirty_points or self.render_scheduler.busy):
+            return
+        _, _, output_width, output_height, interpolation = self._render_key
+        key = mesh_key(self.mesh_grid.get_points_array(), output_width, output_height, interpolation,
+                       self.use_fixed_point_maps)
+        self.render_cache.put(key, (self.mapX, self.mapY, self.fixed_maps, self.output_image))
+        self._render_shared = True
+
+    def _restore_cached_render(self, output_width: Optional[int] = None, output_height: Optional[int] = None) -> bool:
+        """Reinstall a cached render of the current mesh state instead of rendering"""
+        if output_width is None:
+            output_width = self.input_image.shape[1]
+        if output_height is None:
+            output_height = self.input_image.shape[0]
+        interpolation = self.mesh_grid.interpolation
+        render_key = (self.mesh_grid.rows, self.mesh_grid.cols, output_width, output_height, interpolation)
+        points = self.mesh_grid.get_points_array()
+        entry = self.render_cache.get(mesh_key(points, output_width, output_height, interpolation,
+                                               self.use_fixed_point_maps))
+        if entry is None:
+            entry = self._load_disk_maps(points, render_key)
+        if entry is None:
+            return False
+
+        self.mapX, self.mapY, self.fixed_maps, self.output_image = entry
+        self._render_key = render_key
+        self._dirty_points = set()
+        self._render_shared = True
+        return True
+
+    def _load_disk_maps(self, points: np.ndarray, render_key: tuple) -> Optional[tuple]:
+        """Rebuild a render from memory-mapped disk maps when a full render would be needed anyway"""
+        if self.disk_cache is None or (self._dirty_points is not None and render_key == self._render_key):
+            return None
+        _, _, output_width, output_height, interpolation = render_key
+        maps = self.disk_cache.get(mesh_key(points, output_width, output_height, interpolation))
+        if maps is None:
+            return None
+
+        mapX, mapY = maps
+        output, fixed_maps = self._remap(self.input_image, mapX, mapY, self.use_fixed_point_maps)
+        entry = (mapX, mapY, fixed_maps, output)
+        self.render_cache.put(mesh_key(points, output_width, output_height, interpolation, self.use_fixed_point_maps),
+                              entry)
+        return entry
+
+    def render_preview(self, output_width: Optional[int] = None, output_height: Optional[int] = None) -> Optional[np.ndarray]:
+        """Fast low-resolution render for feedback while dragging; full-quality maps and output are left untouched"""
+        if self.input_image is None or self.mesh_grid is None:
+            return None
+
+        if output_width is None:
+            output_width = self.input_image.shape[1]
+        if output_height is None:
+            output_height = self.input_image.shape[0]
+
+        preview_width = max(1, int(round(output_width * self.preview_scale)))
+        preview_height = max(1, int(round(output_height * self.preview_scale)))
+        mapX, mapY = self.warp_engine.compute_maps(self.mesh_grid.get_points_array(), preview_width, preview_height,
+                                                   self.mesh_grid.interpolation)
+        preview = cv2.remap(self.input_image, mapX, mapY, cv2.INTER_NEAREST)
+        # Scale back up so the views keep their zoom and coordinates
+        preview = cv2.resize(preview, (output_width, output_height), interpolation=cv2.INTER_NEAREST)
         
         if self.on_output_image_changed:
-            self.on_output_image_changed(self.output_image)
+            self.on_output_image_changed(preview)
+        return preview
+
+    def _dirty_rects(self, output_width: int, output_height: int) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Output rectangles around moved points, or None if a full render is cheaper"""
+        if self.output_image is None or self.mapX is None or self.mapY is None:
+            return None
+
+        interpolation = self.mesh_grid.interpolation
+        tables = self.warp_engine.table_cache.get_tables(self.mesh_grid.rows, self.mesh_grid.cols,
+                                                         output_width, output_height, interpolation)
+        rects = [tables.affected_rect(row, col) for row, col in self._dirty_points]
+        rects = [r for r in rects if r[2] > r[0] and r[3] > r[1]]
+        dirty_area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+        if dirty_area > self.max_dirty_fraction * output_width * output_height:
+            return None
+        return rects
+
+    def configure_tiled_render(self, enabled: bool, tile_height: Optional[int] = None, workers: Optional[int] = None):
+        """Enable banded multi-threaded rendering and set its band height and worker count"""
+        self.use_tiled_render = enabled
+        if tile_height is not None:
+            self.tiled_remapper.tile_height = tile_height
+        if workers is not None:
+            self.tiled_remapper.workers = workers
+
+    def set_fixed_point_maps(self, enabled: bool):
+        """Switch between float32 maps and packed fixed-point maps for remapping"""
+        if enabled != self.use_fixed_point_maps:
+            # The current output was sampled the other way, so the next render starts over
+            self._dirty_points = None
+        self.use_fixed_point_maps = enabled
+        if not enabled:
+            self.fixed_maps = None
+
+    def get_fixed_point_maps(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Current maps converted once to CV_16SC2 plus interpolation table"""
+        if self.mapX is None or self.mapY is None:
+            return None
+        if self.fixed_maps is None:
+            self.fixed_maps = cv2.convertMaps(self.mapX, self.mapY, cv2.CV_16SC2)
+        return self.fixed_maps
+
+    @staticmethod
+    def _remap(image: np.ndarray, mapX: np.ndarray, mapY: np.ndarray,
+               fixed_point: bool) -> Tuple[np.ndarray, Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """Remap with float maps or with fixed-point maps converted from them"""
+        if fixed_point:
+            fixed_maps = cv2.convertMaps(mapX, mapY, cv2.CV_16SC2)
+            return cv2.remap(image, fixed_maps[0], fixed_maps[1], cv2.INTER_LINEAR), fixed_maps
+        return cv2.remap(image, mapX, mapY, cv2.INTER_LINEAR), None
+
+    def remap_image(self, image: np.ndarray, rect: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        """Warp an image with the current maps, optionally only one output rectangle"""
+        if self.mapX is None or self.mapY is None:
+            return None
+
+        x0, y0, x1, y1 = rect if rect is not None else (0, 0, self.mapX.shape[1], self.mapX.shape[0])
+        if self.use_fixed_point_maps:
+            map1, map2 = self.get_fixed_point_maps()
+            return cv2.remap(image, map1[y0:y1, x0:x1], map2[y0:y1, x0:x1], cv2.INTER_LINEAR)
+        return cv2.remap(image, self.mapX[y0:y1, x0:x1], self.mapY[y0:y1, x0:x1], cv2.INTER_LINEAR)
 
     def save_mesh(self, filepath: str) -> bool:
         if self.mesh_grid is None:
@@ -94,10 +523,8 @@ class MeshWarpViewModel:
             return False
             
         try:
-            data = self.mesh_grid.to_dict()
-            with open(filepath, "w") as f:
-                json.dump(data, f, indent=2)
-                
+            save_mesh(self.mesh_grid, filepath)
+
             if self.on_status_changed:
                 self.on_status_changed(f"Mesh saved to: {filepath}")
             return True
@@ -113,16 +540,15 @@ class MeshWarpViewModel:
             return False
             
         try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
-            
             h, w = self.input_image.shape[:2]
-            self.mesh_grid = MeshGrid.from_dict(data, h, w)
+            self.mesh_grid = load_mesh(filepath, h, w)
+            self._reset_edit_state()
             
             if self.on_mesh_updated:
                 self.on_mesh_updated()
                 
-            self.update_output_image()
+            self.calibrate_warp_engine()
+            self.request_output_update()
             
             if self.on_status_changed:
                 self.on_status_changed(f"Mesh loaded from: {filepath}")
@@ -132,6 +558,55 @@ class MeshWarpViewModel:
                 self.on_status_changed(f"Error loading mesh: {e}")
             return False
 
+    def save_session(self, filepath: str) -> bool:
+        """Record the current image path, mesh and output size"""
+        if self.image_path is None or self.mesh_grid is None:
+            return False
+            
+        try:
+            output_size = list(self._render_key[2:4]) if self._render_key is not None else None
+            session = {"image": os.path.abspath(self.image_path), "mesh": self.mesh_grid.to_dict(),
+                       "output_size": output_size}
+            os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+            with open(filepath, "w") as f:
+                json.dump(session, f, indent=2)
+            return True
+        except Exception as e:
+            if self.on_status_changed:
+                self.on_status_changed(f"Error saving session: {e}")
+            return False
+
+    def restore_session(self, filepath: str) -> bool:
+        """Reopen the image, mesh and output size of a saved session with a single render"""
+        try:
+            with open(filepath, "r") as f:
+                session = json.load(f)
+            
+            image = read_image(session["image"])
+            
+            self.input_image = image
+            self.image_path = session["image"]
+            self.render_cache.clear()
+            h, w = image.shape[:2]
+            self.mesh_grid = MeshGrid.from_dict(session["mesh"], h, w)
+            self._reset_edit_state()
+            if self.on_input_image_changed:
+                self.on_input_image_changed(self.input_image)
+            if self.on_mesh_updated:
+                self.on_mesh_updated()
+            
+            output_width, output_height = session.get("output_size") or (w, h)
+            self.calibrate_warp_engine(output_width, output_height)
+            self.request_output_update(output_width, output_height)
+            
+            if self.on_status_changed:
+                self.on_status_changed(f"Session restored: {self.image_path}")
+            return True
+        except Exception as e:
+            if self.on_status_changed:
+                self.on_status_changed(f"Error restoring session: {e}")
+            return False
+
     def save_result(self, filepath: str) -> bool:
         if self.output_image is None:
             if self.on_status_changed:
@@ -139,7 +614,7 @@ class MeshWarpViewModel:
             return False
             
         try:
-            cv2.imwrite(filepath, self.output_image)
+            write_image(filepath, self.output_image)
             if self.on_status_changed:
                 self.on_status_changed(f"Result image saved to: {filepath}")
             return True
@@ -148,37 +623,160 @@ class MeshWarpViewModel:
                 self.on_status_changed(f"Error saving result: {e}")
             return False
 
-    def save_maps(self, filepath: str) -> bool:
+    def render_streaming(self, source_path: str, output_path: str, output_width: int, output_height: int,
+                         strip_height: int = 256) -> bool:
+        """Warp an image too large for memory straight from disk to disk with the current mesh
+
+        With render_in_background the render runs on its own worker thread and
+        reports progress through on_status_changed; True then means it started.
+        """
+        if self.mesh_grid is None:
+            if self.on_status_changed:
+                self.on_status_changed("No mesh to render")
+            return False
+        if self._streaming is not None and not self._streaming.done():
+            if self.on_status_changed:
+                self.on_status_changed("A streaming render is already running")
+            return False
+
+        points = self.mesh_grid.get_points_array().copy()
+        interpolation = self.mesh_grid.interpolation
+        if not self.render_in_background:
+            return self._stream(source_path, output_path, output_width, output_height, strip_height, points,
+                                interpolation)
+
+        if self._stream_executor is None:
+            self._stream_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream")
+        self._stream_stop.clear()
+        self._streaming = self._stream_executor.submit(self._stream, source_path, output_path, output_width,
+                                                       output_height, strip_height, points, interpolation)
+        if self.on_status_changed:
+            self.on_status_changed(f"Streaming render to: {output_path}")
+        return True
+
+    def cancel_streaming(self):
+        """Stop a background streaming render after its current strip"""
+        self._stream_stop.set()
+
+    def _stream(self, source_path: str, output_path: str, output_width: int, output_height: int,
+                strip_height: int, points: np.ndarray, interpolation: str) -> bool:
+        def on_progress(rows: int, total: int):
+            self._post_status(f"Streaming render: {rows * 100 // total}% ({rows}/{total} rows)")
+
+        try:
+            source = open_image_source(source_path)
+            renderer = StreamingRenderer(strip_height=strip_height, grayscale=False)
+            renderer.render(self.warp_engine, points, source, output_path, output_width, output_height,
+                            interpolation, on_progress, self._stream_stop)
+            self._post_status(f"Streamed result saved to: {output_path}")
+            return True
+        except Exception as e:
+            if self._stream_stop.is_set():
+                self._post_status(f"Streaming render cancelled; {output_path} is incomplete")
+            else:
+                self._post_status(f"Error streaming render: {e}")
+            return False
+
+    def _post_status(self, message: str):
+        """on_status_changed from any thread, through the scheduler's dispatch when there is one"""
+        callback = self.on_status_changed
+        if callback is None:
+            return
+        if self.render_scheduler.dispatch is not None:
+            self.render_scheduler.dispatch(lambda: callback(message))
+        else:
+            callback(message)
+
+    def save_maps(self, filepath: str, map_format: str = "npz") -> bool:
+        """Export the current maps in one of MAP_FORMATS"""
         if self.mapX is None or self.mapY is None:
             if self.on_status_changed:
                 self.on_status_changed("No maps to save")
             return False
             
         try:
-            np.savez(filepath, mapX=self.mapX, mapY=self.mapY)
+            fixed_maps = self.get_fixed_point_maps() if map_format == "fixed" else None
+            paths = save_maps(filepath, self.mapX, self.mapY, map_format, fixed_maps)
             if self.on_status_changed:
-                self.on_status_changed(f"Maps saved to: {filepath}")
+                self.on_status_changed(f"Maps saved to: {', '.join(paths)}")
             return True
         except Exception as e:
             if self.on_status_changed:
                 self.on_status_changed(f"Error saving maps: {e}")
             return False
 
+    def load_maps(self, filepath: str) -> bool:
+        """Remap the input straight from exported maps, without evaluating the mesh
+
+        The maps stay in use until the mesh is edited or re-rendered.
+        """
+        if self.input_image is None:
+            if self.on_status_changed:
+                self.on_status_changed("Load an image first")
+            return False
+
+        try:
+            map1, map2 = load_maps(filepath)
+            self.render_scheduler.cancel()
+            self.output_image = cv2.remap(self.input_image, map1, map2, cv2.INTER_LINEAR)
+            if is_fixed_point_maps(map1, map2):
+                self.fixed_maps = (map1, map2)
+                self.mapX, self.mapY = cv2.convertMaps(map1, map2, cv2.CV_32FC1)
+            else:
+                self.mapX, self.mapY = map1, map2
+                self.fixed_maps = None
+            # The output no longer matches the mesh, and loaded arrays may be read-only memory maps
+            self._dirty_points = None
+            self._render_shared = True
+
+            if self.on_output_image_changed:
+                self.on_output_image_changed(self.output_image)
+            if self.on_status_changed:
+                height, width = self.mapX.shape
+                self.on_status_changed(f"Maps loaded from: {filepath} ({width}x{height})")
+            return True
+        except Exception as e:
+            if self.on_status_changed:
+                self.on_status_changed(f"Error loading maps: {e}")
+            return False
+
+    def get_inverse_maps(self, step: int = 8) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Maps from input image pixels to output pixels for the current render"""
+        if self.mapX is None or self.mapY is None or self.input_image is None:
+            return None
+        h, w = self.input_image.shape[:2]
+        # Loaded maps may not come from this mesh; extra lattice lines then only cost time
+        return compute_inverse_maps(self.mapX, self.mapY, w, h, step,
+                                    grid_shape=(self.mesh_grid.rows, self.mesh_grid.cols))
+
+    def save_inverse_maps(self, filepath: str, map_format: str = "npz") -> bool:
+        """Export maps from input to output pixels in one of MAP_FORMATS, like save_maps"""
+        inverse = self.get_inverse_maps()
+        if inverse is None:
+            if self.on_status_changed:
+                self.on_status_changed("No maps to invert")
+            return False
+            
+        try:
+            paths = save_maps(filepath, inverse[0], inverse[1], map_format)
+            if self.on_status_changed:
+                self.on_status_changed(f"Inverse maps saved to: {', '.join(paths)}")
+            return True
+        except Exception as e:
+            if self.on_status_changed:
+                self.on_status_changed(f"Error saving inverse maps: {e}")
+            return False
+
+    def transform_points(self, points: np.ndarray, direction: str = "forward") -> Optional[np.ndarray]:
+        """Map (N, 2) points between output and input coordinates of the current render"""
+        if self.mesh_grid is None or self.mapX is None:
+            return None
+        output_height, output_width = self.mapX.shape
+        return self.mesh_grid.transform_points(points, direction, output_width, output_height)
+
     def get_point_info(self, x: int, y: int, max_distance: int = 10) -> Optional[Tuple[MeshPoint, float]]:
         """Find closest mesh point within max_distance pixels"""
         if self.mesh_grid is None:
             return None
             
-        closest_point = None
-        min_dist = float('inf')
-        
-        for row in self.mesh_grid.points:
-            for point in row:
-                dist = ((x - point.x)**2 + (y - point.y)**2)**0.5
-                if dist < min_dist:
-                    min_dist = dist
-                    closest_point = point
-                    
-        if min_dist <= max_distance:
-            return closest_point, min_dist
-        return None
+        return self.mesh_grid.find_nearest_point(x, y, max_distance)
@@ -0,0 +1,77 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+# A render job: snapshot() runs on the UI thread and returns the work for the worker (or None to skip)
+SnapshotCallback = Callable[[], Optional[Callable[[], object]]]
+# finish(result, superseded) runs on the UI thread; result is the work's return value or its exception
+FinishCallback = Callable[[object, bool], None]
+
+class RenderScheduler:
+    """Runs one render at a time on a worker thread with latest-wins scheduling
+
+    request() only records that a render is wanted. The snapshot callback is
+    invoked once the worker is free, so any number of requests made while a
+    render is in flight collapse into one follow-up render of the newest
+    state. Completed results are handed to dispatch (for example a Tk after()
+    queue) so finish runs on the UI thread; without dispatch it runs on the
+    worker thread.
+    """
+    def __init__(self, dispatch: Optional[Callable[[Callable[[], None]], None]] = None):
+        self.dispatch = dispatch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self._pending: Optional[Tuple[SnapshotCallback, FinishCallback]] = None
+        self._busy = False
+        # Results of renders started before the last cancel() are dropped
+        self._epoch = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    def request(self, snapshot: SnapshotCallback, finish: FinishCallback):
+        """Ask for a render of the current state; replaces any request still waiting"""
+        self._pending = (snapshot, finish)
+        if not self._busy:
+            self._start_next()
+
+    def cancel(self) -> bool:
+        """Drop the waiting request and ignore the render in flight; True if one was in flight"""
+        self._pending = None
+        self._epoch += 1
+        in_flight = self._busy
+        self._busy = False
+        return in_flight
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _start_next(self):
+        snapshot, finish = self._pending
+        self._pending = None
+        work = snapshot()
+        if work is None:
+            return
+
+        self._busy = True
+        epoch = self._epoch
+        future = self._executor.submit(work)
+        future.add_done_callback(lambda f: self._post(lambda: self._complete(f, epoch, finish)))
+
+    def _post(self, callback: Callable[[], None]):
+        if self.dispatch is not None:
+            self.dispatch(callback)
+        else:
+            callback()
+
+    def _complete(self, future: Future, epoch: int, finish: FinishCallback):
+        if epoch != self._epoch:
+            return
+        self._busy = False
+        try:
+            result = future.result()
+        except Exception as e:
+            result = e
+        finish(result, self._pending is not None)
+        if self._pending is not None:
+            self._start_next()
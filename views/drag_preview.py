@@ -0,0 +1,47 @@
+import time
+import tkinter as tk
+from typing import Optional
+from viewmodels.mesh_warp_vm import MeshWarpViewModel
+
+class DragPreviewScheduler:
+    """Coalesces drag events into rate-capped previews and one full render once the drag settles
+
+    Every drag event only marks a preview as pending; at most one preview
+    is rendered per frame interval no matter how many motion events arrive.
+    A full-quality render runs on release or after the pointer has been
+    idle for idle_ms.
+    """
+    def __init__(self, widget: tk.Misc, viewmodel: MeshWarpViewModel, max_fps: float = 15, idle_ms: int = 300):
+        self.widget = widget
+        self.vm = viewmodel
+        self.max_fps = max_fps
+        self.idle_ms = idle_ms
+        self._preview_job: Optional[str] = None
+        self._idle_job: Optional[str] = None
+        self._last_preview = 0.0
+
+    def on_drag(self):
+        """Call after every drag event that moved a point"""
+        if self._preview_job is None:
+            wait = self._last_preview + 1.0 / self.max_fps - time.perf_counter()
+            self._preview_job = self.widget.after(max(0, int(wait * 1000)), self._render_preview)
+        if self._idle_job is not None:
+            self.widget.after_cancel(self._idle_job)
+        self._idle_job = self.widget.after(self.idle_ms, self.finish)
+
+    def finish(self):
+        """Drop pending previews and render at full quality"""
+        self.cancel()
+        self.vm.request_output_update()
+
+    def cancel(self):
+        for job in (self._preview_job, self._idle_job):
+            if job is not None:
+                self.widget.after_cancel(job)
+        self._preview_job = None
+        self._idle_job = None
+
+    def _render_preview(self):
+        self._preview_job = None
+        self._last_preview = time.perf_counter()
+        self.vm.render_preview()
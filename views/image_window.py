@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable
 import numpy as np
 
 from views.mesh_canvas import MeshCanvas
+from models.metrics import SpanStats, format_stats
 
 class ImageWindow(tk.Toplevel):
     def __init__(self, title: str, width: int = 500, height: int = 600, **kwargs):
@@ -50,6 +51,9 @@ class ImageWindow(tk.Toplevel):
         self.status_bar = ttk.Label(self, text="", relief=tk.SUNKEN)
         self.status_bar.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
         
+        # Rolling per-stage render timings (last/p50/p95), hidden until metrics arrive
+        self.metrics_bar = ttk.Label(self, text="", relief=tk.SUNKEN, font=("TkFixedFont", 8))
+        
         # Event callbacks
         self.on_zoom_change: Optional[Callable[[float], None]] = None
         self.on_zoom_reset: Optional[Callable[[], None]] = None
@@ -84,6 +88,14 @@ class ImageWindow(tk.Toplevel):
         """Update status bar with message"""
         self._update_status_bar(message)
 
+    def update_metrics(self, stats: Dict[str, SpanStats]):
+        """Show last/p50/p95 milliseconds per render stage below the status bar"""
+        if not stats:
+            self.metrics_bar.grid_remove()
+            return
+        self.metrics_bar.config(text="last/p50/p95: " + format_stats(stats))
+        self.metrics_bar.grid(row=3, column=0, sticky="ew", padx=5, pady=(0, 5))
+
     def _on_window_resize(self, event):
         """Handle window resize events"""
         if event.widget == self:
@@ -1,11 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import os
-from typing import Optional
+from typing import Optional, Tuple
 import numpy as np
 
 from views.image_window import ImageWindow
 from viewmodels.mesh_warp_vm import MeshWarpViewModel
+from views.drag_preview import DragPreviewScheduler
+from views.tk_dispatch import TkDispatcher
+from models.interpolation import INTERPOLATION_MODES
+from models.map_io import MAP_FORMATS
+from models.disk_cache import APP_DIR, DiskMapCache
+
+# Last image, mesh and output size, restored on the next launch
+SESSION_FILE = os.path.join(APP_DIR, "session.json")
+# Directory to dump a cProfile and tracemalloc snapshot of every render into, if set
+PROFILE_DIR_ENV = "MESHWARP_PROFILE_DIR"
 
 class MainWindow(tk.Tk):
     def __init__(self):
@@ -45,6 +55,22 @@ class MainWindow(tk.Tk):
         self.vm.on_mesh_updated = self._on_mesh_updated
         self.vm.on_status_changed = self._on_status_changed
         
+        # Stage timings of the render and of the result canvas, shown under the result image
+        self.result_window.get_canvas().metrics = self.vm.metrics
+        self.vm.on_metrics = self.result_window.update_metrics
+        # Opt-in per-render cProfile/tracemalloc dumps
+        if os.environ.get(PROFILE_DIR_ENV):
+            self.vm.enable_profiling(os.environ[PROFILE_DIR_ENV])
+        
+        # Full renders run on a worker thread and are posted back to the Tk loop
+        self.vm.render_scheduler.dispatch = TkDispatcher(self)
+        self.vm.render_in_background = True
+        
+        # Low-resolution previews while dragging, full render once the drag settles
+        self.drag_preview = DragPreviewScheduler(self, self.vm)
+        # (row, col) of the point being dragged, latched on click
+        self.dragged_point: Optional[Tuple[int, int]] = None
+        
         # Set up canvas callbacks
         input_canvas = self.input_window.get_canvas()
         input_canvas.bind_click(self._on_canvas_click)
@@ -57,10 +83,18 @@ class MainWindow(tk.Tk):
         
         self.create_widgets()
         
-        # Load default image if available
-        default_image = os.path.join("images", "Test Image1-051503.bmp")
-        if os.path.exists(default_image):
-            self.vm.load_image(default_image)
+        # Maps persist across launches, so restoring a session only memory-maps them back in
+        try:
+            self.vm.disk_cache = DiskMapCache()
+        except OSError:
+            self.vm.disk_cache = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        # Reopen the last session, otherwise load the default image if available
+        if not (os.path.exists(SESSION_FILE) and self.vm.restore_session(SESSION_FILE)):
+            default_image = os.path.join("images", "Test Image1-051503.bmp")
+            if os.path.exists(default_image):
+                self.vm.load_image(default_image)
 
     def create_widgets(self):
         # Main controls
@@ -91,6 +125,26 @@ class MainWindow(tk.Tk):
         
         ttk.Button(grid_frame, text="Resize Grid", command=self._on_resize_click).pack(padx=5, pady=5)
         
+        # Undo/redo of point moves
+        history_frame = ttk.Frame(grid_frame)
+        history_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Button(history_frame, text="Undo", command=self._on_undo_click).pack(side=tk.LEFT, padx=5)
+        ttk.Button(history_frame, text="Redo", command=self._on_redo_click).pack(side=tk.LEFT, padx=5)
+        self.bind_all("<Control-z>", lambda e: self._on_undo_click())
+        self.bind_all("<Control-y>", lambda e: self._on_redo_click())
+        
+        # Interpolation mode
+        mode_frame = ttk.Frame(grid_frame)
+        mode_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(mode_frame, text="Interpolation:").pack(side=tk.LEFT)
+        self.interpolation_var = tk.StringVar(value="bilinear")
+        interpolation_box = ttk.Combobox(mode_frame, textvariable=self.interpolation_var,
+                                         values=INTERPOLATION_MODES, state="readonly", width=10)
+        interpolation_box.pack(side=tk.LEFT, padx=5)
+        interpolation_box.bind("<<ComboboxSelected>>", self._on_interpolation_change)
+        
         # Output size controls
         size_frame = ttk.LabelFrame(main_frame, text="Output Size")
         size_frame.pack(fill=tk.X, pady=5)
@@ -109,6 +163,10 @@ class MainWindow(tk.Tk):
         
         ttk.Button(size_frame, text="Update", command=self._on_update_click).pack(padx=5, pady=5)
         
+        self.fixed_point_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(size_frame, text="Fixed-point maps", variable=self.fixed_point_var,
+                        command=self._on_fixed_point_toggle).pack(padx=5, pady=5)
+        
         # Save/Load controls
         save_frame = ttk.LabelFrame(main_frame, text="Save/Load")
         save_frame.pack(fill=tk.X, pady=5)
@@ -120,10 +178,22 @@ class MainWindow(tk.Tk):
         ttk.Button(button_frame, text="Load Mesh", command=self._on_load_mesh_click).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Save Result", command=self._on_save_result_click).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Save Maps", command=self._on_save_maps_click).pack(side=tk.LEFT, padx=2)
+        
+        # Map export format and loading maps back without the mesh
+        maps_frame = ttk.Frame(save_frame)
+        maps_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(maps_frame, text="Map format:").pack(side=tk.LEFT)
+        self.map_format_var = tk.StringVar(value="npz")
+        ttk.Combobox(maps_frame, textvariable=self.map_format_var, values=MAP_FORMATS,
+                     state="readonly", width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(maps_frame, text="Load Maps", command=self._on_load_maps_click).pack(side=tk.LEFT, padx=5)
+        ttk.Button(save_frame, text="Save Inverse Maps", command=self._on_save_inverse_maps_click).pack(padx=5, pady=5)
+        ttk.Button(save_frame, text="Stream Render...", command=self._on_stream_render_click).pack(padx=5, pady=5)
 
     def _on_load_click(self):
         filepath = filedialog.askopenfilename(
-            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp")]
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp *.tif *.tiff")]
         )
         if filepath:
             self.vm.load_image(filepath)
@@ -136,25 +206,31 @@ class MainWindow(tk.Tk):
         except ValueError:
             self._on_status_changed("Invalid grid dimensions")
 
+    def _on_interpolation_change(self, event=None):
+        self.vm.set_interpolation(self.interpolation_var.get())
+
     def _on_update_click(self):
         try:
             width = int(self.width_var.get())
             height = int(self.height_var.get())
-            self.vm.update_output_image(width, height)
+            self.vm.request_output_update(width, height)
         except ValueError:
             self._on_status_changed("Invalid output dimensions")
 
+    def _on_fixed_point_toggle(self):
+        self.vm.set_fixed_point_maps(self.fixed_point_var.get())
+
     def _on_save_mesh_click(self):
         filepath = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json")]
+            defaultextension=".mesh",
+            filetypes=[("Binary mesh files", "*.mesh"), ("JSON files", "*.json")]
         )
         if filepath:
             self.vm.save_mesh(filepath)
 
     def _on_load_mesh_click(self):
         filepath = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json")]
+            filetypes=[("Mesh files", "*.mesh *.json"), ("All files", "*.*")]
         )
         if filepath:
             self.vm.load_mesh(filepath)
@@ -164,7 +240,9 @@ class MainWindow(tk.Tk):
             defaultextension=".png",
             filetypes=[
                 ("PNG files", "*.png"),
+                ("TIFF files", "*.tif *.tiff"),
                 ("JPEG files", "*.jpg"),
+                ("NumPy files", "*.npy"),
                 ("All files", "*.*")
             ]
         )
@@ -172,28 +250,89 @@ class MainWindow(tk.Tk):
             self.vm.save_result(filepath)
 
     def _on_save_maps_click(self):
+        map_format = self.map_format_var.get()
+        extension = ".npy" if map_format == "npy" else ".npz"
         filepath = filedialog.asksaveasfilename(
-            defaultextension=".npz",
-            filetypes=[("NumPy files", "*.npz")]
+            defaultextension=extension,
+            filetypes=[("NumPy files", "*" + extension)]
         )
         if filepath:
-            self.vm.save_maps(filepath)
+            self.vm.save_maps(filepath, map_format)
+
+    def _on_load_maps_click(self):
+        filepath = filedialog.askopenfilename(
+            filetypes=[("Map files", "*.npz *.npy"), ("All files", "*.*")]
+        )
+        if filepath:
+            self.vm.load_maps(filepath)
+
+    def _on_save_inverse_maps_click(self):
+        map_format = self.map_format_var.get()
+        extension = ".npy" if map_format == "npy" else ".npz"
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=extension,
+            filetypes=[("NumPy files", "*" + extension)]
+        )
+        if filepath:
+            self.vm.save_inverse_maps(filepath, map_format)
+
+    def _on_stream_render_click(self):
+        source_path = filedialog.askopenfilename(
+            filetypes=[("Streamable images", "*.bmp *.npy"), ("All files", "*.*")]
+        )
+        if not source_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".bmp",
+            filetypes=[("BMP files", "*.bmp"), ("NumPy files", "*.npy")]
+        )
+        if not output_path:
+            return
+        try:
+            width = int(self.width_var.get())
+            height = int(self.height_var.get())
+            self.vm.render_streaming(source_path, output_path, width, height)
+        except ValueError:
+            self._on_status_changed("Invalid output dimensions")
+
+    def _on_close(self):
+        self.vm.save_session(SESSION_FILE)
+        self.vm.render_scheduler.shutdown()
+        self.vm.cancel_streaming()
+        if self.vm.disk_cache is not None:
+            self.vm.disk_cache.flush()
+        self.destroy()
 
     def _on_canvas_click(self, x: float, y: float):
+        self.vm.begin_edit()
         point_info = self.vm.get_point_info(x, y)
         if point_info:
             point, _ = point_info
+            # Keep the grabbed point for the whole drag; merged motion events can jump
+            # further than the hit-test radius between frames
+            self.dragged_point = (point.row, point.col)
             self.vm.move_point(point.row, point.col, x, y)
 
     def _on_canvas_drag(self, x: float, y: float):
-        point_info = self.vm.get_point_info(x, y)
-        if point_info:
-            point, _ = point_info
-            self.vm.move_point(point.row, point.col, x, y)
-            self.input_window.update_status(f"Moving point ({point.row}, {point.col}) to ({x:.1f}, {y:.1f})")
+        if self.dragged_point is None:
+            return
+        row, col = self.dragged_point
+        self.vm.move_point(row, col, x, y)
+        self.drag_preview.on_drag()
+        self.input_window.update_status(f"Moving point ({row}, {col}) to ({x:.1f}, {y:.1f})")
 
     def _on_canvas_release(self):
-        self.vm.update_output_image()
+        self.dragged_point = None
+        self.vm.end_edit()
+        self.drag_preview.finish()
+
+    def _on_undo_click(self):
+        self.drag_preview.cancel()
+        self.vm.undo()
+
+    def _on_redo_click(self):
+        self.drag_preview.cancel()
+        self.vm.redo()
 
     def _on_input_mouse_move(self, x: float, y: float):
         point_info = self.vm.get_point_info(x, y)
@@ -204,7 +343,11 @@ class MainWindow(tk.Tk):
             self.input_window.update_status(f"Input: ({x:.1f}, {y:.1f})")
 
     def _on_output_mouse_move(self, x: float, y: float):
-        self.result_window.update_status(f"Output: ({x:.1f}, {y:.1f})")
+        source = self.vm.transform_points(np.array([[x, y]]))
+        if source is None:
+            self.result_window.update_status(f"Output: ({x:.1f}, {y:.1f})")
+        else:
+            self.result_window.update_status(f"Output: ({x:.1f}, {y:.1f}) <- Input: ({source[0, 0]:.1f}, {source[0, 1]:.1f})")
 
     def _on_input_image_changed(self, image: np.ndarray):
         self.input_window.display_image(image)
@@ -218,6 +361,9 @@ class MainWindow(tk.Tk):
             canvas.clear_mesh()
             canvas.draw_mesh_lines(self.vm.mesh_grid.points)
             canvas.draw_mesh_points(self.vm.mesh_grid.points)
+            # A loaded mesh or restored session brings its own interpolation
+            if self.interpolation_var.get() != self.vm.mesh_grid.interpolation:
+                self.interpolation_var.set(self.vm.mesh_grid.interpolation)
 
     def _on_status_changed(self, message: str):
         self.input_window.update_status(message)
@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, Callable, Tuple
+from typing import Dict, Optional, Callable, Tuple
 import numpy as np
 import cv2
 from models.mesh_grid import MeshPoint
-from utils.image_utils import display_image
+from contextlib import nullcontext
+from models.metrics import RenderMetrics
+from utils.image_utils import create_tk_image, place_image
 
 class MeshCanvas(ttk.Frame):
     def __init__(self, master, title: str, **kwargs):
@@ -43,10 +45,10 @@ class MeshCanvas(ttk.Frame):
         self.canvas.bind('<Configure>', self._on_canvas_configure)
         
         # Add scrollbars
-        self.y_scrollbar = ttk.Scrollbar(self.canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.y_scrollbar = ttk.Scrollbar(self.canvas_frame, orient=tk.VERTICAL, command=self._on_yview)
         self.y_scrollbar.grid(row=0, column=1, sticky="ns")
         
-        self.x_scrollbar = ttk.Scrollbar(self.canvas_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        self.x_scrollbar = ttk.Scrollbar(self.canvas_frame, orient=tk.HORIZONTAL, command=self._on_xview)
         self.x_scrollbar.grid(row=1, column=0, sticky="ew")
         
         self.canvas.configure(xscrollcommand=self.x_scrollbar.set, yscrollcommand=self.y_scrollbar.set)
@@ -58,6 +60,7 @@ class MeshCanvas(ttk.Frame):
         
         # Image reference
         self.photo = None
+        self._redraw_job: Optional[str] = None
         
         # Mesh drawing settings
         self.line_color = "blue"
@@ -70,16 +73,36 @@ class MeshCanvas(ttk.Frame):
         # Mouse tracking
         self.canvas.bind("<Motion>", self._on_mouse_move)
         self.on_mouse_move: Optional[Callable[[float, float], None]] = None
+        
+        # Motion events are coalesced so callbacks only see the latest position per frame
+        self.motion_interval_ms = 16
+        self._pending_motion: Dict[str, Tuple[Callable[[float, float], None], float, float]] = {}
+        self._motion_job: Optional[str] = None
+        
+        # Timings of the resize, PhotoImage and canvas item stages, when set by the owner
+        self.metrics: Optional[RenderMetrics] = None
 
     def display_image(self, image: np.ndarray):
-        """Display an image on the canvas"""
-        self.original_image = image.copy()
+        """Display an image on the canvas (kept by reference; only the visible part is converted)"""
+        self.original_image = image
         self._update_zoomed_image()
 
     def _on_canvas_configure(self, event):
         """Handle canvas resize events"""
         if self.original_image is not None:
-            self._update_zoomed_image()
+            self._draw_visible_image()
+
+    def _on_xview(self, *args):
+        self.canvas.xview(*args)
+        self._schedule_redraw()
+
+    def _on_yview(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_redraw()
+
+    def _schedule_redraw(self):
+        if self._redraw_job is None:
+            self._redraw_job = self.after_idle(self._draw_visible_image)
 
     def _update_zoomed_image(self):
         """Update the displayed image based on zoom factor"""
@@ -90,19 +113,50 @@ class MeshCanvas(ttk.Frame):
         new_w = int(w * self.zoom_factor)
         new_h = int(h * self.zoom_factor)
         
-        # Resize image
-        self.zoomed_image = cv2.resize(self.original_image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-        
         # Update scrollregion to match image size
         self.canvas.config(scrollregion=(0, 0, new_w, new_h))
         
         # Display image
-        self.photo = display_image(self.zoomed_image, self.canvas)
+        self._draw_visible_image()
         # Redraw mesh with new zoom if we have points
         if hasattr(self, 'current_points'):
-            self.clear_mesh()
-            self.draw_mesh_lines(self.current_points)
-            self.draw_mesh_points(self.current_points)
+            with self._span("mesh"):
+                self.clear_mesh()
+                self.draw_mesh_lines(self.current_points)
+                self.draw_mesh_points(self.current_points)
+
+    def _span(self, name: str):
+        return self.metrics.span(name) if self.metrics is not None else nullcontext()
+
+    def _draw_visible_image(self):
+        """Scale and convert only the part of the image inside the viewport"""
+        self._redraw_job = None
+        if self.original_image is None:
+            return
+
+        h, w = self.original_image.shape[:2]
+        zoom = self.zoom_factor
+        left = max(0.0, self.canvas.canvasx(0))
+        top = max(0.0, self.canvas.canvasy(0))
+        right = min(w * zoom, left + max(self.canvas.winfo_width(), 1))
+        bottom = min(h * zoom, top + max(self.canvas.winfo_height(), 1))
+        
+        # Source pixels covering the viewport, plus one for interpolation at the edges
+        x0, y0 = int(left / zoom), int(top / zoom)
+        x1 = min(w, int(np.ceil(right / zoom)) + 1)
+        y1 = min(h, int(np.ceil(bottom / zoom)) + 1)
+        if x1 <= x0 or y1 <= y0:
+            self.canvas.delete("image")
+            return
+
+        region = self.original_image[y0:y1, x0:x1]
+        size = (max(1, int(round((x1 - x0) * zoom))), max(1, int(round((y1 - y0) * zoom))))
+        with self._span("resize"):
+            self.zoomed_image = cv2.resize(region, size, interpolation=cv2.INTER_LINEAR)
+        with self._span("photo"):
+            self.photo = create_tk_image(self.zoomed_image)
+        with self._span("canvas"):
+            place_image(self.photo, self.canvas, int(round(x0 * zoom)), int(round(y0 * zoom)))
 
     def set_zoom(self, factor: float):
         """Set zoom factor and update display"""
@@ -128,10 +182,23 @@ class MeshCanvas(ttk.Frame):
     def _on_mouse_move(self, event):
         """Handle mouse movement and update coordinates"""
         if self.on_mouse_move:
-            # Convert coordinates to original image space with subpixel precision
-            x = event.x / self.zoom_factor
-            y = event.y / self.zoom_factor
-            self.on_mouse_move(x, y)
+            self._queue_motion("move", self.on_mouse_move, event)
+
+    def _queue_motion(self, kind: str, callback: Callable[[float, float], None], event):
+        """Keep only the newest event of each kind until the next frame"""
+        # Convert coordinates to original image space with subpixel precision
+        self._pending_motion[kind] = (callback, event.x / self.zoom_factor, event.y / self.zoom_factor)
+        if self._motion_job is None:
+            self._motion_job = self.after(self.motion_interval_ms, self.flush_motion)
+
+    def flush_motion(self):
+        """Deliver pending motion events now"""
+        if self._motion_job is not None:
+            self.after_cancel(self._motion_job)
+            self._motion_job = None
+        pending, self._pending_motion = self._pending_motion, {}
+        for callback, x, y in pending.values():
+            callback(x, y)
 
     def clear_mesh(self):
         """Clear all mesh elements from the canvas"""
@@ -202,15 +269,21 @@ class MeshCanvas(ttk.Frame):
 
     def bind_click(self, callback: Callable[[float, float], None]):
         """Bind left mouse click event with subpixel precision"""
-        self.canvas.bind("<Button-1>", lambda e: callback(e.x/self.zoom_factor, e.y/self.zoom_factor))
+        def on_click(e):
+            self.flush_motion()
+            callback(e.x/self.zoom_factor, e.y/self.zoom_factor)
+        self.canvas.bind("<Button-1>", on_click)
 
     def bind_drag(self, callback: Callable[[float, float], None]):
-        """Bind mouse drag event with subpixel precision"""
-        self.canvas.bind("<B1-Motion>", lambda e: callback(e.x/self.zoom_factor, e.y/self.zoom_factor))
+        """Bind mouse drag event with subpixel precision, coalesced to one call per frame"""
+        self.canvas.bind("<B1-Motion>", lambda e: self._queue_motion("drag", callback, e))
 
     def bind_release(self, callback: Callable[[], None]):
-        """Bind mouse release event"""
-        self.canvas.bind("<ButtonRelease-1>", lambda e: callback())
+        """Bind mouse release event; pending drag positions are delivered first"""
+        def on_release(e):
+            self.flush_motion()
+            callback()
+        self.canvas.bind("<ButtonRelease-1>", on_release)
 
     def get_size(self) -> Tuple[int, int]:
         """Get current canvas size"""
@@ -1,11 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import os
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 import numpy as np
 
 from views.mesh_canvas import MeshCanvas
 from viewmodels.mesh_warp_vm import MeshWarpViewModel
+from views.drag_preview import DragPreviewScheduler
+from views.tk_dispatch import TkDispatcher
+from models.interpolation import INTERPOLATION_MODES
+from models.map_io import MAP_FORMATS
 from models.mesh_grid import MeshPoint
 
 class MeshWarpView(ttk.Frame):
@@ -19,6 +23,15 @@ class MeshWarpView(ttk.Frame):
         self.vm.on_mesh_updated = self._on_mesh_updated
         self.vm.on_status_changed = self._on_status_changed
         
+        # Full renders run on a worker thread and are posted back to the Tk loop
+        self.vm.render_scheduler.dispatch = TkDispatcher(self)
+        self.vm.render_in_background = True
+        
+        # Low-resolution previews while dragging, full render once the drag settles
+        self.drag_preview = DragPreviewScheduler(self, self.vm)
+        # (row, col) of the point being dragged, latched on click
+        self.dragged_point: Optional[Tuple[int, int]] = None
+        
         self.create_widgets()
         
         # Load default image if available
@@ -90,6 +103,18 @@ class MeshWarpView(ttk.Frame):
         resize_button = ttk.Button(grid_frame, text="Resize Grid", command=self._on_resize_click)
         resize_button.pack(side=tk.LEFT, padx=20)
         
+        ttk.Label(grid_frame, text="Interpolation:").pack(side=tk.LEFT, padx=5)
+        self.interpolation_var = tk.StringVar(value="bilinear")
+        interpolation_box = ttk.Combobox(grid_frame, textvariable=self.interpolation_var,
+                                         values=INTERPOLATION_MODES, state="readonly", width=10)
+        interpolation_box.pack(side=tk.LEFT, padx=5)
+        interpolation_box.bind("<<ComboboxSelected>>", self._on_interpolation_change)
+        
+        ttk.Button(grid_frame, text="Undo", command=self._on_undo_click).pack(side=tk.LEFT, padx=5)
+        ttk.Button(grid_frame, text="Redo", command=self._on_redo_click).pack(side=tk.LEFT, padx=5)
+        self.bind_all("<Control-z>", lambda e: self._on_undo_click())
+        self.bind_all("<Control-y>", lambda e: self._on_redo_click())
+        
         # Output size controls
         size_frame = ttk.Frame(controls_frame)
         size_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -107,6 +132,11 @@ class MeshWarpView(ttk.Frame):
         update_button = ttk.Button(size_frame, text="Update", command=self._on_update_click)
         update_button.pack(side=tk.LEFT, padx=20)
         
+        self.fixed_point_var = tk.BooleanVar(value=False)
+        fixed_point_check = ttk.Checkbutton(size_frame, text="Fixed-point maps", variable=self.fixed_point_var,
+                                            command=self._on_fixed_point_toggle)
+        fixed_point_check.pack(side=tk.LEFT, padx=5)
+        
         # Save/Load controls
         button_frame = ttk.Frame(controls_frame)
         button_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -115,6 +145,12 @@ class MeshWarpView(ttk.Frame):
         ttk.Button(button_frame, text="Load Mesh", command=self._on_load_mesh_click).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Save Result", command=self._on_save_result_click).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Save Maps", command=self._on_save_maps_click).pack(side=tk.LEFT, padx=5)
+        self.map_format_var = tk.StringVar(value="npz")
+        ttk.Combobox(button_frame, textvariable=self.map_format_var, values=MAP_FORMATS,
+                     state="readonly", width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Load Maps", command=self._on_load_maps_click).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Save Inverse Maps", command=self._on_save_inverse_maps_click).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Stream Render...", command=self._on_stream_render_click).pack(side=tk.LEFT, padx=5)
         
         # Status bar
         self.status_bar = ttk.Label(self, text="", relief=tk.SUNKEN)
@@ -151,11 +187,15 @@ class MeshWarpView(ttk.Frame):
 
     def _on_output_mouse_move(self, x: int, y: int):
         """Handle mouse movement over output canvas"""
-        self._update_status_bar(f"Output: ({x:.1f}, {y:.1f})")
+        source = self.vm.transform_points(np.array([[x, y]]))
+        if source is None:
+            self._update_status_bar(f"Output: ({x:.1f}, {y:.1f})")
+        else:
+            self._update_status_bar(f"Output: ({x:.1f}, {y:.1f}) <- Input: ({source[0, 0]:.1f}, {source[0, 1]:.1f})")
 
     def _on_load_click(self):
         filepath = filedialog.askopenfilename(
-            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp")]
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp *.tif *.tiff")]
         )
         if filepath:
             self.vm.load_image(filepath)
@@ -168,25 +208,31 @@ class MeshWarpView(ttk.Frame):
         except ValueError:
             self._on_status_changed("Invalid grid dimensions")
 
+    def _on_interpolation_change(self, event=None):
+        self.vm.set_interpolation(self.interpolation_var.get())
+
     def _on_update_click(self):
         try:
             width = int(self.width_var.get())
             height = int(self.height_var.get())
-            self.vm.update_output_image(width, height)
+            self.vm.request_output_update(width, height)
         except ValueError:
             self._on_status_changed("Invalid output dimensions")
 
+    def _on_fixed_point_toggle(self):
+        self.vm.set_fixed_point_maps(self.fixed_point_var.get())
+
     def _on_save_mesh_click(self):
         filepath = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json")]
+            defaultextension=".mesh",
+            filetypes=[("Binary mesh files", "*.mesh"), ("JSON files", "*.json")]
         )
         if filepath:
             self.vm.save_mesh(filepath)
 
     def _on_load_mesh_click(self):
         filepath = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json")]
+            filetypes=[("Mesh files", "*.mesh *.json"), ("All files", "*.*")]
         )
         if filepath:
             self.vm.load_mesh(filepath)
@@ -196,7 +242,9 @@ class MeshWarpView(ttk.Frame):
             defaultextension=".png",
             filetypes=[
                 ("PNG files", "*.png"),
+                ("TIFF files", "*.tif *.tiff"),
                 ("JPEG files", "*.jpg"),
+                ("NumPy files", "*.npy"),
                 ("All files", "*.*")
             ]
         )
@@ -204,28 +252,81 @@ class MeshWarpView(ttk.Frame):
             self.vm.save_result(filepath)
 
     def _on_save_maps_click(self):
+        map_format = self.map_format_var.get()
+        extension = ".npy" if map_format == "npy" else ".npz"
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=extension,
+            filetypes=[("NumPy files", "*" + extension)]
+        )
+        if filepath:
+            self.vm.save_maps(filepath, map_format)
+
+    def _on_load_maps_click(self):
+        filepath = filedialog.askopenfilename(
+            filetypes=[("Map files", "*.npz *.npy"), ("All files", "*.*")]
+        )
+        if filepath:
+            self.vm.load_maps(filepath)
+
+    def _on_save_inverse_maps_click(self):
+        map_format = self.map_format_var.get()
+        extension = ".npy" if map_format == "npy" else ".npz"
         filepath = filedialog.asksaveasfilename(
-            defaultextension=".npz",
-            filetypes=[("NumPy files", "*.npz")]
+            defaultextension=extension,
+            filetypes=[("NumPy files", "*" + extension)]
         )
         if filepath:
-            self.vm.save_maps(filepath)
+            self.vm.save_inverse_maps(filepath, map_format)
+
+    def _on_stream_render_click(self):
+        source_path = filedialog.askopenfilename(
+            filetypes=[("Streamable images", "*.bmp *.npy"), ("All files", "*.*")]
+        )
+        if not source_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".bmp",
+            filetypes=[("BMP files", "*.bmp"), ("NumPy files", "*.npy")]
+        )
+        if not output_path:
+            return
+        try:
+            width = int(self.width_var.get())
+            height = int(self.height_var.get())
+            self.vm.render_streaming(source_path, output_path, width, height)
+        except ValueError:
+            self._on_status_changed("Invalid output dimensions")
 
     def _on_canvas_click(self, x: int, y: int):
+        self.vm.begin_edit()
         point_info = self.vm.get_point_info(x, y)
         if point_info:
             point, _ = point_info
+            # Keep the grabbed point for the whole drag; merged motion events can jump
+            # further than the hit-test radius between frames
+            self.dragged_point = (point.row, point.col)
             self.vm.move_point(point.row, point.col, x, y)
 
     def _on_canvas_drag(self, x: int, y: int):
-        point_info = self.vm.get_point_info(x, y)
-        if point_info:
-            point, _ = point_info
-            self.vm.move_point(point.row, point.col, x, y)
-            self._update_status_bar(f"Moving point ({point.row}, {point.col}) to ({x:.1f}, {y:.1f})")
+        if self.dragged_point is None:
+            return
+        row, col = self.dragged_point
+        self.vm.move_point(row, col, x, y)
+        self.drag_preview.on_drag()
+        self._update_status_bar(f"Moving point ({row}, {col}) to ({x:.1f}, {y:.1f})")
 
     def _on_canvas_release(self):
-        self.vm.update_output_image()
+        self.dragged_point = None
+        self.vm.end_edit()
+        self.drag_preview.finish()
+
+    def _on_undo_click(self):
+        self.drag_preview.cancel()
+        self.vm.undo()
+
+    def _on_redo_click(self):
+        self.drag_preview.cancel()
+        self.vm.redo()
 
     def _on_input_image_changed(self, image: np.ndarray):
         self.input_canvas.display_image(image)
@@ -238,6 +339,9 @@ class MeshWarpView(ttk.Frame):
             self.input_canvas.clear_mesh()
             self.input_canvas.draw_mesh_lines(self.vm.mesh_grid.points)
             self.input_canvas.draw_mesh_points(self.vm.mesh_grid.points)
+            # A loaded mesh or restored session brings its own interpolation
+            if self.interpolation_var.get() != self.vm.mesh_grid.interpolation:
+                self.interpolation_var.set(self.vm.mesh_grid.interpolation)
 
     def _on_status_changed(self, message: str):
         self._update_status_bar(message)
@@ -0,0 +1,26 @@
+import queue
+import tkinter as tk
+from typing import Callable
+
+class TkDispatcher:
+    """Runs callbacks posted from worker threads on the Tk main loop
+
+    Tk must only be touched from its own thread, so workers put callbacks
+    on a queue that the main loop drains with after().
+    """
+    def __init__(self, widget: tk.Misc, poll_ms: int = 15):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._queue: 'queue.Queue[Callable[[], None]]' = queue.Queue()
+        self.widget.after(self.poll_ms, self._poll)
+
+    def __call__(self, callback: Callable[[], None]):
+        self._queue.put(callback)
+
+    def _poll(self):
+        try:
+            while True:
+                self._queue.get_nowait()()
+        except queue.Empty:
+            pass
+        self.widget.after(self.poll_ms, self._poll)